@@ -5,9 +5,18 @@ import signal
 
 import discord
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional (and unavailable on Windows); fall back to the default loop
+    uvloop = None
+
 from config import TOKEN, LOG_LEVEL, LOG_FORMAT
 from bot_state import client, data_manager, player_manager, queue_manager, health_monitor
 from utils.guild_setup import ensure_guild_music_panel
+from commands.music_commands import process_play_request
+from ui.embeds import forget_guild_ui, update_stable_message
+from utils.message_utils import clear_channel_messages
+from utils.vote_manager import VoteManager
 
 # Setup logging
 logging.basicConfig(level=getattr(logging, LOG_LEVEL), format=LOG_FORMAT)
@@ -50,8 +59,6 @@ async def on_voice_state_update(member, before, after):
                 and guild_data
                 and 'vote_skip' in guild_data
             ):
-                from utils.vote_manager import VoteManager
-
                 if VoteManager.remove_user_vote(guild_data, member.id):
                     logger.info(
                         "Removed vote from user %s who left voice channel in guild %s",
@@ -59,8 +66,6 @@ async def on_voice_state_update(member, before, after):
                         guild_id,
                     )
 
-                    from ui.embeds import update_stable_message
-
                     await update_stable_message(guild_id)
 
     except Exception:
@@ -96,12 +101,10 @@ async def restore_guild_states():
         client.playback_modes.pop(gid, None)
         queue_manager.cleanup_guild(gid)
 
-        from ui.embeds import forget_guild_ui
-
         forget_guild_ui(gid)
+        data_manager.mark_dirty(client, gid)  # Only the removed guilds' shards need deleting
 
     if guilds_to_remove:
-        await data_manager.save_guilds_data(client)
         logger.info(f'Cleaned up {len(guilds_to_remove)} invalid guilds')
 
     for guild in client.guilds:
@@ -161,8 +164,6 @@ async def on_message(message):
             except discord.HTTPException as e:
                 logger.warning(f"Failed to delete message {message.id}: {e}")
 
-            from commands.music_commands import process_play_request
-
             response_message = await process_play_request(
                 message.author,
                 message.guild,
@@ -174,8 +175,6 @@ async def on_message(message):
                 data_manager,
             )
 
-            from utils.message_utils import clear_channel_messages
-
             stable_message_id = guild_data.get('stable_message_id')
             if stable_message_id:
                 try:
@@ -201,7 +200,7 @@ def load_extensions():
     from commands import music_commands, setup_commands
 
     music_commands.setup_music_commands(client, queue_manager, player_manager, data_manager)
-    setup_commands.setup_admin_commands(client, data_manager)
+    setup_commands.setup_admin_commands(client, data_manager, player_manager, queue_manager)
 
 
 def main():
@@ -210,6 +209,11 @@ def main():
     if not token:
         raise RuntimeError('DISCORD_TOKEN is not set')
 
+    if uvloop is not None:
+        # libuv-backed loop for the gateway, voice and HTTP traffic; client.run picks it up via the policy
+        uvloop.install()
+        logger.info('Using uvloop event loop')
+
     loop = asyncio.get_event_loop()
 
     def handle_loop_exception(loop, context):
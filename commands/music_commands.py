@@ -1,21 +1,64 @@
 import asyncio
 import logging
+import re
+import time
+from typing import Dict, Set
 import discord
 from discord import app_commands
 from discord.ext import commands
 import yt_dlp as youtube_dl
-from config import YTDL_FORMAT_OPTS, FFMPEG_OPTIONS, PlaybackMode, FULL_METADATA_OPTS
+from config import (
+    YTDL_FORMAT_OPTS, FFMPEG_OPTIONS, PlaybackMode, FULL_METADATA_OPTS, FLAT_PLAYLIST_OPTS, IDLE_DISCONNECT_DELAY,
+)
+from ui.embeds import update_stable_message
+from ui.search_view import SearchResultsView, create_search_results_embed
 from utils.validators import is_setup
 from utils.search_cache import search_cache
 from utils.search_optimizer import search_optimizer
-from utils.retry import retry_async
-from utils.cache import song_cache
+from utils.retry import retry_async, run_extraction, YTDL_EXECUTOR
+from utils.cache import song_cache, metadata_cache, extract_video_id, stream_url_expired
+from utils.vote_manager import VoteManager
 
 logger = logging.getLogger(__name__)
 
 # Initialize YouTube DL instances
 ytdl = youtube_dl.YoutubeDL(YTDL_FORMAT_OPTS)
 full_metadata_ytdl = youtube_dl.YoutubeDL(FULL_METADATA_OPTS)
+flat_playlist_ytdl = youtube_dl.YoutubeDL(FLAT_PLAYLIST_OPTS)
+
+# In-flight extractions keyed by normalized link, so concurrent misses share one yt-dlp call
+_inflight: Dict[str, asyncio.Task] = {}
+
+# Links that point at a video or playlist rather than a search query, matched in one pass
+_URL_RE = re.compile(r'(?:list=|watch\?v=|youtu\.be/|music\.youtube\.com/|/shorts/)')
+
+# Song fields read by the player, queue and UI; the rest of a yt-dlp result is dropped at ingest
+_SONG_FIELDS = ('id', 'title', 'uploader', 'duration', 'url', 'webpage_url', 'thumbnail')
+
+# Concurrent yt-dlp extractions while resolving queued playlist stubs ahead of playback
+PLAYLIST_HYDRATE_CONCURRENCY = 8
+
+# Queued stubs resolved while the current track plays, in case playlist hydration has not reached them
+PLAYLIST_PREFETCH_AHEAD = 2
+
+# Strong references to fire-and-forget tasks so they are not garbage collected mid-run
+_background_tasks = set()
+
+def _spawn(coro):
+    """Run a coroutine in the background while keeping a reference to it"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_fire_and_log)
+    return task
+
+def _fire_and_log(task):
+    """Drop the reference to a finished background task and log anything it raised"""
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background task {task.get_coro().__qualname__} failed", exc_info=task.exception())
+
+# Write-behind save of guild data; song starts within the window share a single write
+SAVE_DEBOUNCE_SECONDS = 2.0
 
 def setup_music_commands(client, queue_manager, player_manager, data_manager):
     """Setup music-related commands"""
@@ -87,15 +130,19 @@ def setup_music_commands(client, queue_manager, player_manager, data_manager):
                 return
 
             # Create search results view and embed
-            from ui.search_view import SearchResultsView, create_search_results_embed
-            
             view = SearchResultsView(search_results)
             embed = create_search_results_embed(search_results, query)
             
             # Send search results
             message = await interaction.followup.send(embed=embed, view=view, ephemeral=True)
+
+            # Warm full metadata for the top result while the user decides; it is what a timeout
+            # auto-selects and the most likely pick, and both paths hit the video ID cache
+            top_result = search_results[0]
+            if top_result.get('_fast_result') and top_result.get('webpage_url'):
+                _spawn(search_optimizer.get_full_metadata(top_result['webpage_url']))
             
-            # Wait for selection or timeout
+            # Wait for selection or timeout (the view times out after 30s)
             await view.wait()
             
             # Handle timeout case
@@ -151,10 +198,8 @@ def setup_music_commands(client, queue_manager, player_manager, data_manager):
             )
 
             if response_message:
-                await interaction.followup.send(response_message, ephemeral=True)
-
-            # Clean up after delay
-            await _cleanup_interaction_message(interaction)
+                # Removed after a few seconds by discord.py, without holding the command open
+                await interaction.followup.send(response_message, ephemeral=True, delete_after=5)
 
         except Exception as e:
             logger.error(f"Error in play command: {e}")
@@ -182,9 +227,7 @@ def setup_music_commands(client, queue_manager, player_manager, data_manager):
             )
 
             if response_message:
-                await interaction.followup.send(response_message, ephemeral=True)
-
-            await _cleanup_interaction_message(interaction)
+                await interaction.followup.send(response_message, ephemeral=True, delete_after=5)
 
         except Exception as e:
             logger.error(f"Error in playnext command: {e}")
@@ -193,10 +236,10 @@ def setup_music_commands(client, queue_manager, player_manager, data_manager):
 async def process_play_request(user, guild, channel, link, client, queue_manager,
                                player_manager, data_manager, play_next=False, extra_meta=None):
     """Process a play request from various sources"""
+    logger.debug(
+        f"process_play_request called in guild {guild.id} by {user} with link: {link}"
+    )
     try:
-        logger.debug(
-            f"process_play_request called in guild {guild.id} by {user} with link: {link}"
-        )
         guild_id = str(guild.id)
         guild_data = client.guilds_data.get(guild_id)
 
@@ -204,9 +247,12 @@ async def process_play_request(user, guild, channel, link, client, queue_manager
             return "❌ Please run /setup to initialize the music channel first."
 
         # Update activity timestamp to keep guild data fresh
-        import time
         guild_data['last_activity'] = time.time()
 
+        # Start extracting right away so it overlaps the member lookup and the voice connect;
+        # if the request is rejected below the result still lands in the song cache
+        song_task = _spawn(_extract_song_data(link))
+
         # Ensure user is a guild member
         if not isinstance(user, discord.Member):
             try:
@@ -249,7 +295,7 @@ async def process_play_request(user, guild, channel, link, client, queue_manager
             notify_channel = voice_client.channel
 
         # Extract song information
-        song_data = await _extract_song_data(link)
+        song_data = await song_task
         if not song_data:
             return "❌ Could not extract song information."
 
@@ -291,28 +337,33 @@ async def process_play_request(user, guild, channel, link, client, queue_manager
         logger.error(f"Error processing play request: {e}")
         return "❌ An error occurred while processing your request."
 
-async def _extract_song_data(link, search_mode=False):
+async def _extract_song_data(link, search_mode=False, refresh=False):
     """Extract song data using optimized yt-dlp with caching and two-phase approach with retry logic"""
-    
-    # Check song_cache first (LRU cache with size limit - fast and memory-efficient)
-    cached_result = song_cache.get(link)
-    if cached_result is not None:
-        logger.debug(f"Song cache hit for: {link[:50]}")
-        return cached_result
-    
-    # Check cache first (outside retry loop to avoid redundant cache checks)
-    is_search = 'list=' not in link and 'watch?v=' not in link and 'youtu.be/' not in link
-    
-    if is_search:
-        cached_result = search_cache.get(link, search_mode)
+    is_search = _URL_RE.search(link) is None
+
+    if not refresh:
+        # Check song_cache first (LRU cache with size limit - fast and memory-efficient)
+        cached_result = song_cache.get(link)
+        if cached_result is None and is_search:
+            # Check cache first (outside retry loop to avoid redundant cache checks)
+            cached_result = search_cache.get(link, search_mode)
+            if cached_result is not None:
+                logger.debug(f"Search cache hit for query: {link[:50]}")
+                # Also cache in song_cache for faster future access
+                song_cache.set(link, cached_result)
+        elif cached_result is not None:
+            logger.debug(f"Song cache hit for: {link[:50]}")
+
         if cached_result is not None:
-            logger.debug(f"Search cache hit for query: {link[:50]}")
-            # Also cache in song_cache for faster future access
-            song_cache.set(link, cached_result)
+            if is_search and search_cache.should_refresh_early(link, search_mode):
+                # Serve the cached result and refresh it in the background before it expires
+                logger.debug(f"Early background refresh for query: {link[:50]}")
+                _spawn(_extract_song_data(link, search_mode, refresh=True))
             return cached_result
     
     # Inner function with actual extraction logic
     async def _do_extract():
+        started_at = time.time()
         # Determine if it's a search or direct link
         if is_search:
             # Preprocess query for better results
@@ -324,23 +375,22 @@ async def _extract_song_data(link, search_mode=False):
                 
                 if search_results:
                     # Cache the results
-                    search_cache.set(link, search_results, search_mode=True, ttl=1800)  # 30 minutes
+                    search_cache.set(link, search_results, search_mode=True, ttl=1800,  # 30 minutes
+                                     compute_time=time.time() - started_at)
                     return search_results
                 else:
                     # Fallback to regular search if fast search fails
                     logger.debug(f"Fast search failed, using fallback for: {link}")
                     fallback_results = await search_optimizer.search_with_fallback(optimized_query, max_results=3)
                     if fallback_results:
-                        search_cache.set(link, fallback_results, search_mode=True, ttl=900)  # 15 minutes for fallback
+                        search_cache.set(link, fallback_results, search_mode=True, ttl=900,  # 15 minutes for fallback
+                                         compute_time=time.time() - started_at)
                         return fallback_results
             else:
-                # For direct play, use the same search algorithm as preview and auto-select the top result
-                search_results = await search_optimizer.fast_search(optimized_query, max_results=3)
-
-                if search_results and len(search_results) > 0:
-                    # Take the first result returned by the provider
-                    best_result = search_results[0]
+                # For direct play only the provider's top hit is used (ytsearch1, no ranking pass)
+                best_result = await search_optimizer.get_best_result(optimized_query)
 
+                if best_result:
                     # If it's a fast result, get full metadata for playback
                     if best_result.get('_fast_result', False):
                         full_metadata = await search_optimizer.get_full_metadata(best_result['webpage_url'])
@@ -348,12 +398,13 @@ async def _extract_song_data(link, search_mode=False):
                             best_result = full_metadata
 
                     # Cache the result
-                    search_cache.set(link, best_result, search_mode=False, ttl=3600)  # 1 hour
+                    search_cache.set(link, best_result, search_mode=False, ttl=3600,  # 1 hour
+                                     compute_time=time.time() - started_at)
                     return best_result
                 else:
                     # Fallback to a regular search and pick the first result
                     logger.debug(f"Fast search failed for direct play, using fallback for: {link}")
-                    fallback_results = await search_optimizer.search_with_fallback(optimized_query, max_results=3)
+                    fallback_results = await search_optimizer.search_with_fallback(optimized_query, max_results=1)
                     if fallback_results and len(fallback_results) > 0:
                         best_result = fallback_results[0]
 
@@ -362,48 +413,67 @@ async def _extract_song_data(link, search_mode=False):
                             if full_metadata:
                                 best_result = full_metadata
 
-                        search_cache.set(link, best_result, search_mode=False, ttl=1800)  # 30 minutes for fallback
+                        search_cache.set(link, best_result, search_mode=False, ttl=1800,  # 30 minutes for fallback
+                                         compute_time=time.time() - started_at)
                         return best_result
         else:
-            # Direct link - use full metadata extraction
+            # Direct link - playlists are listed flat, single videos get full metadata; a mixed
+            # watch?v=...&list=... link plays just that video (full metadata options set noplaylist)
+            video_id = extract_video_id(link)
+            if 'list=' in link and not video_id:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(YTDL_EXECUTOR, run_extraction, flat_playlist_ytdl, link)
+
+            # Any URL form of a recently extracted video is served from memory without a thread hop
+            if video_id:
+                cached_metadata = metadata_cache.get(video_id)
+                if cached_metadata is not None:
+                    return cached_metadata
+
             loop = asyncio.get_running_loop()
-            result = await loop.run_in_executor(
-                None, lambda: full_metadata_ytdl.extract_info(link, download=False)
-            )
+            result = await loop.run_in_executor(YTDL_EXECUTOR, run_extraction, full_metadata_ytdl, link)
+            if result and video_id:
+                metadata_cache.set(video_id, result)
             return result
 
         return None
     
-    # Execute with retry logic
-    try:
-        result = await retry_async(_do_extract, max_retries=3, base_delay=1.0)
-        
+    async def _extract_and_cache():
+        # Execute with retry logic
+        try:
+            result = await retry_async(_do_extract, max_retries=3, base_delay=1.0)
+        except Exception as e:
+            logger.error(f"Error extracting song data after all retries: {e}")
+            return None
+
         # Cache successful results in song_cache for faster future access
         if result:
             song_cache.set(link, result)
             logger.debug(f"Cached extraction result in song_cache for: {link[:50]}")
-        
         return result
-    except Exception as e:
-        logger.error(f"Error extracting song data after all retries: {e}")
-        return None
+
+    # Join an identical extraction that is already running instead of starting another one;
+    # the extraction is its own task, so a cancelled caller never cancels it for the others
+    inflight_key = f"{'search' if search_mode else 'single'}:{link.strip()}"
+    task = _inflight.get(inflight_key)
+    if task is None:
+        task = asyncio.create_task(_extract_and_cache())
+        _inflight[inflight_key] = task
+        task.add_done_callback(lambda _: _inflight.pop(inflight_key, None))
+    else:
+        logger.debug(f"Joining in-flight extraction for: {link[:50]}")
+    return await asyncio.shield(task)
 
 async def _process_single_song(song_data, user, guild_id, client, queue_manager,
                                player_manager, data_manager, play_next, extra_meta):
     """Process a single song"""
     try:
-        song_info = song_data.copy()
-        song_info['requester'] = user.mention
-        song_info['requester_id'] = user.id  # Store user ID for easier comparison
-
-        if extra_meta:
-            song_info.update(extra_meta)
-        else:
-            song_info['source'] = 'youtube'
+        song_info = _project_song(song_data)
+        song_info.update(_request_meta(user, extra_meta))
 
         voice_client = player_manager.voice_clients.get(guild_id)
 
-        if not voice_client.is_playing() and not voice_client.is_paused():
+        if not _is_busy(guild_id, voice_client):
             # Play immediately
             client.guilds_data[guild_id]['current_song'] = song_info
             await _play_song(guild_id, song_info, client, player_manager, queue_manager, data_manager)
@@ -419,7 +489,6 @@ async def _process_single_song(song_data, user, guild_id, client, queue_manager,
                 msg = f"❌ Could not add song to queue. Queue may be full (max 100 songs) or there was an error."
 
         # Update UI
-        from ui.embeds import update_stable_message
         await update_stable_message(guild_id)
 
         return msg
@@ -428,81 +497,201 @@ async def _process_single_song(song_data, user, guild_id, client, queue_manager,
         logger.error(f"Error processing single song: {e}")
         return "❌ Error processing the song."
 
+def _request_meta(user, extra_meta):
+    """Fields stamped on every song queued by one request"""
+    request_meta = {
+        'requester': user.mention,
+        'requester_id': user.id,  # Store user ID for easier comparison
+        'source': 'youtube',
+    }
+    if extra_meta:
+        request_meta.update(extra_meta)
+    return request_meta
+
+def _project_song(song_data):
+    """Keep only the fields the bot reads from an extracted song instead of copying the whole result"""
+    # One lookup per field; yt-dlp results carry hundreds of keys, so never copy the whole dict
+    values = map(song_data.get, _SONG_FIELDS)
+    return {key: value for key, value in zip(_SONG_FIELDS, values) if value is not None}
+
+def _playlist_entry_stub(entry):
+    """Build a lightweight queue entry from a flat playlist entry"""
+    webpage_url = entry.get('webpage_url') or entry.get('url')
+    if not webpage_url or not webpage_url.startswith('http'):
+        webpage_url = f"https://www.youtube.com/watch?v={entry.get('id')}"
+
+    return {
+        'id': entry.get('id'),
+        'title': entry.get('title') or 'Unknown title',
+        'uploader': entry.get('uploader') or entry.get('channel'),
+        'duration': entry.get('duration') or 0,
+        'webpage_url': webpage_url,
+        '_needs_resolve': True,
+    }
+
 async def _process_playlist(song_data, user, guild_id, client, queue_manager,
                             player_manager, data_manager, play_next, extra_meta):
     """Process a playlist"""
     try:
         entries = song_data.get('entries', [])
         added_songs = []
+        request_meta = _request_meta(user, extra_meta)
 
         for entry in entries:
             if entry is None:
                 continue
 
-            song_info = entry.copy()
-            song_info['requester'] = user.mention
-            song_info['requester_id'] = user.id  # Store user ID for easier comparison
-
-            if extra_meta:
-                song_info.update(extra_meta)
+            if entry.get('_type') in ('url', 'url_transparent'):
+                # Flat playlist entry - queue a stub and resolve the stream URL at play time
+                song_info = _playlist_entry_stub(entry)
             else:
-                song_info['source'] = 'youtube'
-
-            queue_manager.add_song(guild_id, song_info, False)  # Always add to end for playlists
-            added_songs.append(song_info['title'])
-
-        # Start playing if nothing is currently playing
-        voice_client = player_manager.voice_clients.get(guild_id)
-        if not voice_client.is_playing() and not voice_client.is_paused():
-            await _play_next_song(guild_id, client, queue_manager, player_manager, data_manager)
+                song_info = _project_song(entry)
+            song_info.update(request_meta)
+            added_songs.append(song_info)
+
+        # Only what fits in the queue is queued (and resolved); the rest of the playlist is dropped
+        queued_songs = added_songs[:queue_manager.get_queue_room(guild_id)]
+        if added_songs and not queued_songs:
+            return "❌ Could not add the playlist. The queue is full (max 100 songs)."
+
+        if queued_songs:
+            # Queue every track in one step (stubs are cheap) so stop, clear and reset see the whole playlist;
+            # the panel refresh below is debounced
+            queue_manager.add_songs(guild_id, queued_songs)  # Always add to end for playlists
+
+            # Start playing if nothing is currently playing
+            voice_client = player_manager.voice_clients.get(guild_id)
+            busy = _is_busy(guild_id, voice_client)
+            if not busy:
+                # Mark the guild busy before the task runs, so a request arriving in between queues
+                # behind this track instead of starting its own; cleared once the start attempt ends
+                _starting_guilds.add(guild_id)
+                start_task = _spawn(_play_next_song(guild_id, client, queue_manager, player_manager, data_manager))
+                start_task.add_done_callback(lambda _: _starting_guilds.discard(guild_id))
+
+            # Only the next few stubs are resolved ahead of time; later ones are resolved by _play_song
+            # as they come up. When nothing was playing, the started track prefetches its successors
+            if busy:
+                _prefetch_upcoming(guild_id, queue_manager)
 
         # Update UI
-        from ui.embeds import update_stable_message
         await update_stable_message(guild_id)
 
         playlist_title = song_data.get('title', 'Unknown playlist')
-        return f"🎶 Added playlist **{playlist_title}** with {len(added_songs)} songs to the queue."
+        return f"🎶 Added playlist **{playlist_title}** with {len(queued_songs)} songs to the queue."
 
     except Exception as e:
         logger.error(f"Error processing playlist: {e}")
         return "❌ Error processing the playlist."
 
+async def _hydrate_entry(song_info, semaphore):
+    """Resolve one queued playlist stub, bounded by the shared semaphore"""
+    async with semaphore:
+        if not song_info.get('_needs_resolve'):
+            return False  # Already resolved by _play_song
+        song_data = await _extract_song_data(song_info['webpage_url'])
+    if song_data and song_data.get('url') and song_info.get('_needs_resolve'):
+        song_info['url'] = song_data['url']
+        _apply_resolved(song_info, song_data)
+        return True
+    return False
+
+async def _hydrate_playlist(guild_id, songs):
+    """Resolve stream URLs for queued playlist stubs with bounded concurrency"""
+    semaphore = asyncio.Semaphore(PLAYLIST_HYDRATE_CONCURRENCY)
+    stubs = [song for song in songs if song.get('_needs_resolve') and song.get('webpage_url')]
+    results = await asyncio.gather(*(_hydrate_entry(song, semaphore) for song in stubs),
+                                   return_exceptions=True)
+    resolved = sum(result is True for result in results)
+    logger.debug(f"Resolved {resolved}/{len(stubs)} playlist entries ahead of playback in guild {guild_id}")
+
+def _prefetch_upcoming(guild_id, queue_manager):
+    """Resolve the stubs at the head of the queue in the background"""
+    upcoming = [
+        song for song in queue_manager.peek_next(guild_id, PLAYLIST_PREFETCH_AHEAD)
+        if song.get('_needs_resolve')
+    ]
+    if upcoming:
+        _spawn(_hydrate_playlist(guild_id, upcoming))
+
+def _invalidate_cached_song(song_info):
+    """Drop cached extraction results for a song whose stream URL was rejected"""
+    webpage_url = song_info.get('webpage_url')
+    if webpage_url:
+        song_cache.remove(webpage_url)
+    video_id = song_info.get('id') or (webpage_url and extract_video_id(webpage_url))
+    if video_id:
+        metadata_cache.remove(video_id)
+
+def _apply_resolved(song_info, song_data):
+    """Fill in the metadata a flat playlist listing did not include"""
+    for key in ('title', 'uploader', 'duration', 'thumbnail'):
+        if song_data.get(key):
+            song_info[key] = song_data[key]
+    song_info.pop('_needs_resolve', None)
+
+# Guilds where a track is being resolved and started: the voice client isn't playing yet, so
+# without this a request arriving in that window would start a second track over the first
+_starting_guilds: Set[str] = set()
+
+def _is_busy(guild_id, voice_client):
+    """Whether a guild is playing, paused, or about to start a track"""
+    if guild_id in _starting_guilds:
+        return True
+    return bool(voice_client and (voice_client.is_playing() or voice_client.is_paused()))
+
 async def _play_song(guild_id, song_info, client, player_manager, queue_manager, data_manager, retry_count=0):
+    """Play a specific song, marking the guild busy until playback has started"""
+    _starting_guilds.add(guild_id)
+    try:
+        await _start_song(guild_id, song_info, client, player_manager, queue_manager, data_manager, retry_count)
+    finally:
+        _starting_guilds.discard(guild_id)
+
+async def _start_song(guild_id, song_info, client, player_manager, queue_manager, data_manager, retry_count=0):
     """Play a specific song with retry logic for failed URLs"""
     max_retries = 2
     
+    logger.debug(f"_play_song called in guild {guild_id} with {song_info.get('title')} (retry {retry_count}/{max_retries})")
     try:
-        logger.debug(f"_play_song called in guild {guild_id} with {song_info.get('title')} (retry {retry_count}/{max_retries})")
         voice_client = player_manager.voice_clients.get(guild_id)
         if not voice_client:
             logger.error(f"No voice client for guild {guild_id}")
             return
 
         # Reset votes for new song
-        from utils.vote_manager import VoteManager
-        guild_data = client.guilds_data.get(guild_id, {})
+        guild_data = client.guilds_data[guild_id]
         song_id = song_info.get('id', song_info.get('webpage_url', 'unknown'))
         VoteManager.reset_votes(guild_data, song_id)
 
-        # Get URL - if it's expired or missing, try to refresh it
+        # Get URL - if it's expired, missing or a flat playlist stub, try to refresh it
         url = song_info.get('url')
-        if not url or retry_count > 0:
+        needs_resolve = song_info.get('_needs_resolve', False)
+        if not url or needs_resolve or retry_count > 0 or stream_url_expired(url):
             logger.info(f"Refreshing URL for song in guild {guild_id}")
             webpage_url = song_info.get('webpage_url')
             if webpage_url:
-                # Re-extract the song data to get a fresh URL
-                async def _refresh_url():
-                    loop = asyncio.get_running_loop()
-                    result = await loop.run_in_executor(
-                        None, lambda: full_metadata_ytdl.extract_info(webpage_url, download=False)
-                    )
-                    return result
+                if retry_count > 0:
+                    # The last stream URL was rejected, so re-extract past the caches
+                    async def _refresh_url():
+                        loop = asyncio.get_running_loop()
+                        return await loop.run_in_executor(YTDL_EXECUTOR, run_extraction, full_metadata_ytdl, webpage_url)
+
+                    refresh = retry_async(_refresh_url, max_retries=2, base_delay=0.5)
+                else:
+                    if url and stream_url_expired(url):
+                        # The cached result may carry the same expired URL, so extract afresh
+                        _invalidate_cached_song(song_info)
+                    # A video extracted recently (queued twice, looped, prefetched) is served from the caches
+                    refresh = _extract_song_data(webpage_url)
                 
                 try:
-                    refreshed_data = await retry_async(_refresh_url, max_retries=2, base_delay=0.5)
+                    refreshed_data = await refresh
                     if refreshed_data and refreshed_data.get('url'):
                         url = refreshed_data['url']
                         song_info['url'] = url  # Update the song info with fresh URL
+                        if needs_resolve:
+                            _apply_resolved(song_info, refreshed_data)
                         logger.info(f"Successfully refreshed URL for '{song_info.get('title')}'")
                 except Exception as refresh_error:
                     logger.error(f"Failed to refresh URL: {refresh_error}")
@@ -513,7 +702,8 @@ async def _play_song(guild_id, song_info, client, player_manager, queue_manager,
             await _play_next_song(guild_id, client, queue_manager, player_manager, data_manager)
             return
 
-        source = discord.FFmpegPCMAudio(url, **FFMPEG_OPTIONS)
+        # Probe the codec so Opus streams are passed through instead of re-encoded in Python
+        source = await discord.FFmpegOpusAudio.from_probe(url, method='fallback', **FFMPEG_OPTIONS)
 
         # Define callback for when song ends
         def after_playing(error):
@@ -521,30 +711,44 @@ async def _play_song(guild_id, song_info, client, player_manager, queue_manager,
                 logger.error(f"Player error in guild {guild_id}: {error}")
                 
                 # If there's a playback error and we haven't exceeded retries, try again
+                if "403" in str(error):
+                    # The cached stream URL has expired; make sure nothing hands it out again
+                    _invalidate_cached_song(song_info)
+
                 if retry_count < max_retries and ("403" in str(error) or "HTTP" in str(error)):
                     logger.info(f"Attempting to retry playback (attempt {retry_count + 1}/{max_retries})")
                     coro = _play_song(guild_id, song_info, client, player_manager, queue_manager, data_manager, retry_count + 1)
-                    asyncio.run_coroutine_threadsafe(coro, client.loop)
+                    client.loop.call_soon_threadsafe(_spawn, coro)
                 else:
                     # Skip to next song
                     coro = _play_next_song(guild_id, client, queue_manager, player_manager, data_manager)
-                    asyncio.run_coroutine_threadsafe(coro, client.loop)
+                    client.loop.call_soon_threadsafe(_spawn, coro)
             else:
-                # Normal song end - play next
-                coro = _play_next_song(guild_id, client, queue_manager, player_manager, data_manager)
-                asyncio.run_coroutine_threadsafe(coro, client.loop)
+                playback_mode = client.playback_modes.get(guild_id, PlaybackMode.NORMAL)
+                current_song = client.guilds_data.get(guild_id, {}).get('current_song')
+                if playback_mode == PlaybackMode.REPEAT_ONE and current_song:
+                    # Repeat straight away instead of going through _play_next_song
+                    coro = _play_song(guild_id, current_song, client, player_manager, queue_manager, data_manager)
+                else:
+                    # Normal song end - play next
+                    coro = _play_next_song(guild_id, client, queue_manager, player_manager, data_manager)
+                # Hand off to the event loop without waiting on it, so the player thread exits at once;
+                # _spawn keeps the task referenced and logs anything it raises
+                client.loop.call_soon_threadsafe(_spawn, coro)
 
         # Start playing
         await player_manager.play_audio_source(guild_id, source, after_playing)
 
         # Store song duration and start time for progress tracking
-        import time
         duration = song_info.get('duration', 0)
-        client.guilds_data[guild_id]['song_duration'] = duration
-        client.guilds_data[guild_id]['song_start_time'] = time.time()  # Track when song started
+        guild_data['song_duration'] = duration
+        guild_data['song_start_time'] = time.time()  # Track when song started
+
+        # Save data (coalesced with other song starts)
+        data_manager.mark_dirty(client, guild_id, delay=SAVE_DEBOUNCE_SECONDS)
 
-        # Save data
-        await data_manager.save_guilds_data(client)
+        # Resolve the next few stubs during this track so the following ones start without a gap
+        _prefetch_upcoming(guild_id, queue_manager)
 
         logger.info(f"Started playing '{song_info.get('title')}' in guild {guild_id}")
 
@@ -559,13 +763,14 @@ async def _play_song(guild_id, song_info, client, player_manager, queue_manager,
 
 async def _play_next_song(guild_id, client, queue_manager, player_manager, data_manager):
     """Play the next song in queue"""
+    logger.debug(f"_play_next_song called in guild {guild_id}")
     try:
-        logger.debug(f"_play_next_song called in guild {guild_id}")
+        guild_data = client.guilds_data[guild_id]
         playback_mode = client.playback_modes.get(guild_id, PlaybackMode.NORMAL)
 
         if playback_mode == PlaybackMode.REPEAT_ONE:
             # Repeat current song
-            current_song = client.guilds_data[guild_id].get('current_song')
+            current_song = guild_data.get('current_song')
             if current_song:
                 await _play_song(guild_id, current_song, client, player_manager, queue_manager, data_manager)
             return
@@ -573,7 +778,7 @@ async def _play_next_song(guild_id, client, queue_manager, player_manager, data_
         # Get next song from queue
         next_song = queue_manager.get_next_song(guild_id)
         if next_song:
-            client.guilds_data[guild_id]['current_song'] = next_song
+            guild_data['current_song'] = next_song
             await _play_song(guild_id, next_song, client, player_manager, queue_manager, data_manager)
         else:
             # No more songs in queue
@@ -582,57 +787,56 @@ async def _play_next_song(guild_id, client, queue_manager, player_manager, data_
                 if queue_manager.restore_repeat_all_playlist(guild_id):
                     next_song = queue_manager.get_next_song(guild_id)
                     if next_song:
-                        client.guilds_data[guild_id]['current_song'] = next_song
+                        guild_data['current_song'] = next_song
                         await _play_song(guild_id, next_song, client, player_manager, queue_manager, data_manager)
                         logger.info(f"Restarting playlist for repeat all mode in guild {guild_id}")
                     else:
                         # Empty playlist, clean up
-                        client.guilds_data[guild_id]['current_song'] = None
+                        guild_data['current_song'] = None
                         client.playback_modes[guild_id] = PlaybackMode.NORMAL
                 else:
                     # No saved playlist, clean up
-                    client.guilds_data[guild_id]['current_song'] = None
+                    guild_data['current_song'] = None
                     client.playback_modes[guild_id] = PlaybackMode.NORMAL
             else:
                 # Normal mode: no more songs, clean up
-                client.guilds_data[guild_id]['current_song'] = None
+                guild_data['current_song'] = None
                 client.playback_modes[guild_id] = PlaybackMode.NORMAL
 
                 # Schedule disconnect after delay
-                from config import IDLE_DISCONNECT_DELAY
                 disconnect_task = asyncio.create_task(
-                    _disconnect_after_delay(guild_id, player_manager, IDLE_DISCONNECT_DELAY)
+                    _disconnect_after_delay(guild_id, player_manager, IDLE_DISCONNECT_DELAY, client, data_manager)
                 )
                 player_manager.add_task(guild_id, 'disconnect_task', disconnect_task)
 
         # Update UI
-        from ui.embeds import update_stable_message
         await update_stable_message(guild_id)
 
     except Exception as e:
         logger.error(f"Error playing next song in guild {guild_id}: {e}")
 
-async def _disconnect_after_delay(guild_id, player_manager, delay):
+async def _disconnect_after_delay(guild_id, player_manager, delay, client, data_manager):
     """Disconnect after a delay if nothing is playing"""
+    logger.debug(f"_disconnect_after_delay scheduled for guild {guild_id} after {delay}s")
     try:
-        logger.debug(f"_disconnect_after_delay scheduled for guild {guild_id} after {delay}s")
         await asyncio.sleep(delay)
-        voice_client = player_manager.voice_clients.get(guild_id)
-        if voice_client and not voice_client.is_playing():
-            await player_manager.disconnect_voice_client(guild_id)
-            from ui.embeds import update_stable_message
-            await update_stable_message(guild_id)
     except asyncio.CancelledError:
-        pass
-    except Exception as e:
-        logger.error(f"Error in disconnect delay for guild {guild_id}: {e}")
+        return  # New music was queued before the delay ran out
 
-async def _cleanup_interaction_message(interaction, delay=5):
-    """Clean up interaction message after delay"""
+    voice_client = player_manager.voice_clients.get(guild_id)
+    if voice_client and not voice_client.is_playing():
+        try:
+            # Once started, the disconnect runs to completion even if this task is cancelled
+            # (disconnect_voice_client itself cancels the guild's registered tasks, this one included)
+            await asyncio.shield(_spawn(_disconnect_idle(guild_id, player_manager, client, data_manager)))
+        except asyncio.CancelledError:
+            pass
+
+async def _disconnect_idle(guild_id, player_manager, client, data_manager):
+    """Save guild data, leave the voice channel and refresh the panel"""
     try:
-        logger.debug(f"Cleaning up interaction message in guild {interaction.guild_id} after {delay}s")
-        await asyncio.sleep(delay)
-        message = await interaction.original_response()
-        await message.delete()
-    except Exception:
-        pass  # Message might already be deleted
+        await data_manager.flush(client)
+        await player_manager.disconnect_voice_client(guild_id)
+        await update_stable_message(guild_id)
+    except Exception as e:
+        logger.error(f"Error in disconnect delay for guild {guild_id}: {e}")
@@ -1,15 +1,31 @@
+import asyncio
 import logging
 
 import discord
 from discord import app_commands
 
 from config import MUSIC_CHANNEL_NAME
-from utils.guild_setup import ensure_guild_music_panel
+from utils.guild_setup import ensure_guild_music_panel, get_setup_lock
+from utils.message_utils import clear_channel_messages
 
 logger = logging.getLogger(__name__)
 
+# Permission bits checked by the admin commands, tested with a single AND on Permissions.value
+# (administrators get every bit in guild_permissions, so they pass the manage channels check too)
+_MANAGE_CHANNELS = discord.Permissions.manage_channels.flag
+_ADMINISTRATOR = discord.Permissions.administrator.flag
 
-def setup_admin_commands(client, data_manager):
+# Replies sent by the admin commands, built once at import instead of on every invocation
+_MSG_NO_MANAGE_CHANNELS = "❌ You need 'Manage Channels' permission to use this command."
+_MSG_NO_ADMINISTRATOR = "❌ You need Administrator permission to use this command."
+_MSG_SETUP_FAILED = "❌ I couldn't prepare the music channel. Please check my permissions and try again."
+_MSG_SETUP_ERROR = "❌ An error occurred during setup. Please try again."
+_MSG_CHANNEL_READY_FMT = "✅ Music commands channel ready in {mention}.".format
+_MSG_RESET_DONE = "✅ Bot configuration has been reset for this server."
+_MSG_RESET_ERROR = "❌ An error occurred during reset. Please try again."
+
+
+def setup_admin_commands(client, data_manager, player_manager, queue_manager):
     """Setup admin/setup commands."""
 
     @client.tree.command(name="setup", description="Set up the music channel and bot UI")
@@ -17,13 +33,16 @@ def setup_admin_commands(client, data_manager):
     async def setup(interaction: discord.Interaction, channel_name: str = MUSIC_CHANNEL_NAME):
         """Set up or repair the bot panel for a guild."""
         try:
-            if not interaction.user.guild_permissions.manage_channels:
+            if not interaction.user.guild_permissions.value & _MANAGE_CHANNELS:
                 await interaction.response.send_message(
-                    "❌ You need 'Manage Channels' permission to use this command.",
+                    _MSG_NO_MANAGE_CHANNELS,
                     ephemeral=True,
                 )
                 return
 
+            # Channel creation and the panel refresh can outlast the 3s interaction window
+            await interaction.response.defer(ephemeral=True, thinking=True)
+
             guild_data, channel, _ = await ensure_guild_music_panel(
                 interaction.guild,
                 channel_name=channel_name,
@@ -31,30 +50,34 @@ def setup_admin_commands(client, data_manager):
             )
 
             if not guild_data or not channel:
-                await interaction.response.send_message(
-                    "❌ I couldn't prepare the music channel. Please check my permissions and try again.",
+                await interaction.followup.send(
+                    _MSG_SETUP_FAILED,
                     ephemeral=True,
                 )
                 return
 
-            await interaction.response.send_message(
-                f"✅ Music commands channel ready in {channel.mention}.",
-                ephemeral=True,
+            # The reply and the channel cleanup are independent requests, so run them together
+            # (clear_channel_messages logs its own failures and never raises)
+            await asyncio.gather(
+                interaction.followup.send(
+                    _MSG_CHANNEL_READY_FMT(mention=channel.mention),
+                    ephemeral=True,
+                ),
+                clear_channel_messages(channel, guild_data.get('stable_message_id')),
             )
 
-            from utils.message_utils import clear_channel_messages
-
-            stable_message_id = guild_data.get('stable_message_id')
-            if stable_message_id:
-                await clear_channel_messages(channel, stable_message_id)
-
         except Exception as e:
             logger.error(f"Error in setup command for guild {interaction.guild.id}: {e}")
 
             try:
                 if not interaction.response.is_done():
                     await interaction.response.send_message(
-                        "❌ An error occurred during setup. Please try again.",
+                        _MSG_SETUP_ERROR,
+                        ephemeral=True,
+                    )
+                else:
+                    await interaction.followup.send(
+                        _MSG_SETUP_ERROR,
                         ephemeral=True,
                     )
             except Exception:
@@ -64,27 +87,30 @@ def setup_admin_commands(client, data_manager):
     async def reset(interaction: discord.Interaction):
         """Reset command to clear bot data for a guild."""
         try:
-            if not interaction.user.guild_permissions.administrator:
+            if not interaction.user.guild_permissions.value & _ADMINISTRATOR:
                 await interaction.response.send_message(
-                    "❌ You need Administrator permission to use this command.",
+                    _MSG_NO_ADMINISTRATOR,
                     ephemeral=True,
                 )
                 return
 
-            guild_id = str(interaction.guild.id)
+            # Waiting on a setup or voice connection in progress can outlast the 3s interaction window
+            await interaction.response.defer(ephemeral=True, thinking=True)
 
-            from bot_state import player_manager, queue_manager
+            guild_id = str(interaction.guild.id)
 
-            await player_manager.disconnect_voice_client(guild_id)
-            queue_manager.cleanup_guild(guild_id)
+            # Wait for any setup in progress so it can't recreate data we are about to drop
+            async with get_setup_lock(guild_id):
+                await player_manager.disconnect_voice_client(guild_id)
+                queue_manager.cleanup_guild(guild_id)
 
-            client.guilds_data.pop(guild_id, None)
-            client.playback_modes.pop(guild_id, None)
+                client.guilds_data.pop(guild_id, None)
+                client.playback_modes.pop(guild_id, None)
 
-            await data_manager.save_guilds_data(client)
+                data_manager.mark_dirty(client, guild_id)
 
-            await interaction.response.send_message(
-                "✅ Bot configuration has been reset for this server.",
+            await interaction.followup.send(
+                _MSG_RESET_DONE,
                 ephemeral=True,
             )
 
@@ -92,7 +118,17 @@ def setup_admin_commands(client, data_manager):
 
         except Exception as e:
             logger.error(f"Error in reset command for guild {interaction.guild.id}: {e}")
-            await interaction.response.send_message(
-                "❌ An error occurred during reset. Please try again.",
-                ephemeral=True,
-            )
+
+            try:
+                if not interaction.response.is_done():
+                    await interaction.response.send_message(
+                        _MSG_RESET_ERROR,
+                        ephemeral=True,
+                    )
+                else:
+                    await interaction.followup.send(
+                        _MSG_RESET_ERROR,
+                        ephemeral=True,
+                    )
+            except Exception:
+                pass
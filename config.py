@@ -1,5 +1,6 @@
 import os
 from enum import Enum
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -10,11 +11,14 @@ TOKEN = os.getenv('DISCORD_TOKEN')
 DATA_FILE = 'guilds_data.json'
 MUSIC_CHANNEL_NAME = 'leo-song-requests'
 
-# FFmpeg options - Enhanced for better streaming stability
-FFMPEG_OPTIONS = {
-    'before_options': '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5 -nostdin',
+# FFmpeg options - Enhanced for better streaming stability (read-only; shared by every player)
+FFMPEG_OPTIONS = MappingProxyType({
+    # A small probe window: YouTube audio streams carry their codec headers up front, so ffmpeg
+    # doesn't need to read seconds of audio before it starts emitting packets
+    'before_options': '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5 -nostdin '
+                      '-probesize 32k -analyzeduration 0',
     'options': '-vn -loglevel warning'
-}
+})
 
 YTDL_HTTP_HEADERS = {
     'User-Agent': (
@@ -24,6 +28,9 @@ YTDL_HTTP_HEADERS = {
     ),
 }
 
+# Persistent yt-dlp cache (YouTube player JS / signature data) so restarts skip re-downloading it
+YTDL_CACHE_DIR = os.getenv('YTDL_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.ytdlp-cache'))
+
 YTDL_EXTRACTOR_ARGS = {
     'youtube': {
         'player_client': ['android_music', 'android', 'web'],
@@ -33,7 +40,8 @@ YTDL_EXTRACTOR_ARGS = {
 
 def _build_ytdl_options(*, flat: bool = False) -> dict:
     options = {
-        'format': 'bestaudio[ext=m4a]/bestaudio[ext=webm]/bestaudio/best',
+        # Prefer Opus audio so FFmpegOpusAudio.from_probe can stream-copy it instead of transcoding
+        'format': 'bestaudio[acodec=opus]/bestaudio[ext=m4a]/bestaudio[ext=webm]/bestaudio/best',
         'quiet': True,
         'no_warnings': True,
         'default_search': 'ytsearch',
@@ -43,6 +51,7 @@ def _build_ytdl_options(*, flat: bool = False) -> dict:
         'retries': 3,
         'extractor_args': YTDL_EXTRACTOR_ARGS,
         'http_headers': YTDL_HTTP_HEADERS,
+        'cachedir': YTDL_CACHE_DIR,
     }
 
     if flat:
@@ -75,6 +84,15 @@ FAST_SEARCH_OPTS = _build_ytdl_options(flat=True)
 
 # Full metadata options for Phase 2 (when user selects a song)
 FULL_METADATA_OPTS = _build_ytdl_options()
+
+# Playlist options - list entries only; each track is resolved when it reaches the head of the queue
+FLAT_PLAYLIST_OPTS = {
+    **_build_ytdl_options(flat=True),
+    'extract_flat': 'in_playlist',
+    # Raise when the playlist itself can't be extracted, so the retry logic sees the failure;
+    # entries are only listed here, so an unavailable track fails (and is skipped) when it is resolved
+    'ignoreerrors': False,
+}
 
 class PlaybackMode(Enum):
     NORMAL = "Normal"
@@ -2,26 +2,110 @@ import asyncio
 import json
 import logging
 import os
-from typing import Dict, Optional, Callable
-import discord
+from typing import Dict, Iterable, Optional, Set
 from discord.ext import commands
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Changes marked within this window share a single write
+SAVE_COALESCE_SECONDS = 0.5
+
+# Guild data keys holding live Discord objects, which are rebuilt at runtime rather than saved
+NON_PERSISTED_KEYS = frozenset({'stable_message'})
+
 class GuildDataManager:
     """Manages persistent data for Discord guilds"""
 
     def __init__(self, data_file: str = "guilds_data.json"):
-        self.data_file = data_file
+        self.data_file = data_file  # Legacy single-file store, read once to migrate
+        # One JSON file per guild, so a change rewrites only that guild's shard
+        self.data_dir = os.path.splitext(data_file)[0]
+        self._save_lock = asyncio.Lock()
+        self._pending_save: Optional[asyncio.TimerHandle] = None
+        self._save_task: Optional[asyncio.Task] = None
+        self._dirty_guilds: Set[str] = set()
+
+    @staticmethod
+    def _serialize(data: dict) -> bytes:
+        """Encode guild data as indented JSON bytes"""
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(data, indent=2).encode('utf-8')
+
+    @staticmethod
+    def _deserialize(raw: bytes) -> dict:
+        """Decode guild data written by _serialize (or the legacy stdlib writer)"""
+        if orjson is not None:
+            return orjson.loads(raw)
+        return json.loads(raw)
+
+    @staticmethod
+    def _persistable(guild_data: dict) -> dict:
+        """Copy of guild data without the live objects (like discord.Message) that can't be serialized"""
+        return {key: value for key, value in guild_data.items() if key not in NON_PERSISTED_KEYS}
+
+    def _shard_path(self, guild_id: str) -> str:
+        return os.path.join(self.data_dir, f"{guild_id}.json")
+
+    def _write_shards(self, payloads: Dict[str, Optional[bytes]], prune: bool = False) -> None:
+        """Write (or, for None, delete) guild shards; prune removes shards of guilds not in payloads"""
+        os.makedirs(self.data_dir, exist_ok=True)
+        for guild_id, payload in payloads.items():
+            path = self._shard_path(guild_id)
+            if payload is None:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                continue
+            # Write to a temporary file and swap it in, so a crash mid-write never truncates a shard
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(temp_path, path)
+
+        if prune:
+            for name in os.listdir(self.data_dir):
+                guild_id, ext = os.path.splitext(name)
+                if ext == '.json' and guild_id not in payloads:
+                    os.remove(os.path.join(self.data_dir, name))
+
+    def _read_store(self) -> Optional[dict]:
+        """Read every shard, or the legacy single file if there are no shards yet"""
+        if os.path.isdir(self.data_dir):
+            guilds_data = {}
+            for name in os.listdir(self.data_dir):
+                guild_id, ext = os.path.splitext(name)
+                if ext != '.json':
+                    continue
+                try:
+                    with open(os.path.join(self.data_dir, name), 'rb') as f:
+                        guilds_data[guild_id] = self._deserialize(f.read())
+                except (OSError, ValueError) as e:
+                    logger.error(f"Skipping unreadable data for guild {guild_id}: {e}")
+            return guilds_data
+
+        if os.path.exists(self.data_file):
+            with open(self.data_file, 'rb') as f:
+                return self._deserialize(f.read())
+        return None
 
     async def load_guilds_data(self, client: commands.Bot) -> None:
         """Load guild data from persistent storage"""
         try:
-            logger.debug(f"Loading guild data from {self.data_file}")
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r') as f:
-                    client.guilds_data = json.load(f)
+            logger.debug(f"Loading guild data from {self.data_dir}")
+            guilds_data = await asyncio.to_thread(self._read_store)
+            if guilds_data is not None:
+                client.guilds_data = guilds_data
                 logger.info(f"Loaded data for {len(client.guilds_data)} guilds")
+                if not os.path.isdir(self.data_dir):
+                    # Migrate the legacy single file to per-guild shards
+                    await self.save_guilds_data(client)
             else:
                 client.guilds_data = {}
                 logger.info("No existing guild data found, starting fresh")
@@ -29,24 +113,50 @@ class GuildDataManager:
             logger.error(f"Error loading guild data: {e}")
             client.guilds_data = {}
 
-    async def save_guilds_data(self, client: commands.Bot) -> None:
-        """Save guild data to persistent storage"""
+    def mark_dirty(self, client: commands.Bot, guild_id: str, delay: float = SAVE_COALESCE_SECONDS) -> None:
+        """Record a guild change and schedule one save for all changes marked within the delay"""
+        self._dirty_guilds.add(guild_id)
+        if self._pending_save is None:
+            self._pending_save = asyncio.get_running_loop().call_later(delay, self._start_pending_save, client)
+
+    def _start_pending_save(self, client: commands.Bot) -> None:
+        self._pending_save = None
+        self._save_task = asyncio.create_task(self._save_dirty(client))
+
+    async def flush(self, client: commands.Bot) -> None:
+        """Write a scheduled save out immediately and wait for one already being written"""
+        if self._save_task is not None and not self._save_task.done():
+            await asyncio.shield(self._save_task)
+        if self._pending_save is None:
+            return
+        self._pending_save.cancel()
+        self._pending_save = None
+        await self._save_dirty(client)
+
+    async def _save_dirty(self, client: commands.Bot) -> None:
+        dirty_guilds, self._dirty_guilds = self._dirty_guilds, set()
+        if dirty_guilds:
+            await self.save_guilds_data(client, dirty_guilds)
+
+    async def save_guilds_data(self, client: commands.Bot, guild_ids: Optional[Iterable[str]] = None) -> None:
+        """Save guild data to persistent storage; all guilds unless specific ones are given"""
         try:
-            logger.debug(f"Saving guild data to {self.data_file}")
-            # Create a copy of the data without the stable_message objects
-            # (since they can't be serialized)
-            data_to_save = {}
-            for guild_id, guild_data in client.guilds_data.items():
-                cleaned_data = {}
-                for key, value in guild_data.items():
-                    # Skip non-serializable objects like discord.Message
-                    if key != 'stable_message' and not isinstance(value, discord.Message):
-                        cleaned_data[key] = value
-                data_to_save[guild_id] = cleaned_data
-
-            with open(self.data_file, 'w') as f:
-                json.dump(data_to_save, f, indent=2)
-            logger.info(f"Saved data for {len(data_to_save)} guilds")
+            full_save = guild_ids is None
+            if full_save:
+                guild_ids = list(client.guilds_data)
+                self._dirty_guilds.clear()  # This save covers every change made so far
+            logger.debug(f"Saving data for {len(guild_ids)} guilds to {self.data_dir}")
+
+            # Encode on the loop (consistent snapshot), write in a thread so disk IO never blocks it;
+            # guilds that no longer have data get their shard removed
+            payloads = {}
+            for guild_id in guild_ids:
+                guild_data = client.guilds_data.get(guild_id)
+                payloads[guild_id] = None if guild_data is None else self._serialize(self._persistable(guild_data))
+
+            async with self._save_lock:
+                await asyncio.to_thread(self._write_shards, payloads, full_save)
+            logger.info(f"Saved data for {len(payloads)} guilds")
         except Exception as e:
             logger.error(f"Error saving guild data: {e}")
 
@@ -55,171 +165,13 @@ class GuildDataManager:
         return client.guilds_data.get(guild_id, {})
 
     def set_guild_data(self, client: commands.Bot, guild_id: str, data: dict) -> None:
-        """Set data for a specific guild"""
+        """Set data for a specific guild and schedule its save"""
         if guild_id not in client.guilds_data:
             client.guilds_data[guild_id] = {}
         client.guilds_data[guild_id].update(data)
+        self.mark_dirty(client, guild_id)
 
     def remove_guild_data(self, client: commands.Bot, guild_id: str) -> None:
-        """Remove data for a specific guild"""
+        """Remove data for a specific guild and schedule its shard's removal"""
         client.guilds_data.pop(guild_id, None)
-
-
-class PlayerManager:
-    """Improved player management with better error handling and cleanup"""
-
-    def __init__(self):
-        self.voice_clients: Dict[str, discord.VoiceClient] = {}
-        self.active_tasks: Dict[str, Dict[str, asyncio.Task]] = {}
-
-    async def get_or_create_voice_client(self, guild_id: str, user_voice_channel: discord.VoiceChannel) -> Optional[discord.VoiceClient]:
-        """Get existing voice client or create new one with proper error handling"""
-        try:
-            logger.debug(
-                f"get_or_create_voice_client called for guild {guild_id} in channel {user_voice_channel}"
-            )
-            permissions = user_voice_channel.permissions_for(user_voice_channel.guild.me)
-            if not permissions.connect or not permissions.speak:
-                raise commands.BotMissingPermissions([perm for perm, allowed in {
-                    'connect': permissions.connect,
-                    'speak': permissions.speak
-                }.items() if not allowed])
-
-            voice_client = self.voice_clients.get(guild_id)
-
-            if voice_client:
-                if voice_client.channel != user_voice_channel:
-                    logger.info(f"Moving voice client in guild {guild_id} to {user_voice_channel}")
-                    await voice_client.move_to(user_voice_channel)
-                return voice_client
-            else:
-                logger.info(f"Connecting to voice channel {user_voice_channel} in guild {guild_id}")
-                voice_client = await user_voice_channel.connect()
-                # Wait briefly to ensure the connection is fully ready
-                for _ in range(5):
-                    if voice_client.is_connected():
-                        break
-                    await asyncio.sleep(0.2)
-                logger.debug(
-                    f"Voice client connected status in guild {guild_id}: {voice_client.is_connected()}"
-                )
-                self.voice_clients[guild_id] = voice_client
-                return voice_client
-
-        except discord.ClientException as e:
-            logger.error(f"ClientException in guild {guild_id}: {e}")
-            raise
-        except discord.errors.Forbidden as e:
-            logger.error(f"Permission error in guild {guild_id}: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error connecting to voice in guild {guild_id}: {e}")
-            raise
-
-    async def disconnect_voice_client(self, guild_id: str, cleanup_tasks: bool = True) -> bool:
-        """Safely disconnect voice client and cleanup resources"""
-        try:
-            logger.debug(f"disconnect_voice_client called for guild {guild_id}")
-            voice_client = self.voice_clients.get(guild_id)
-            if voice_client:
-                if voice_client.is_connected():
-                    await voice_client.disconnect()
-                self.voice_clients.pop(guild_id, None)
-                logger.info(f"Disconnected voice client in guild {guild_id}")
-
-            if cleanup_tasks:
-                await self.cleanup_guild_tasks(guild_id)
-
-            return True
-
-        except Exception as e:
-            logger.error(f"Error disconnecting voice client in guild {guild_id}: {e}")
-            return False
-
-    async def cleanup_guild_tasks(self, guild_id: str):
-        """Clean up all async tasks for a guild"""
-        logger.debug(f"cleanup_guild_tasks called for guild {guild_id}")
-        if guild_id in self.active_tasks:
-            for task_name, task in self.active_tasks[guild_id].items():
-                if not task.done():
-                    task.cancel()
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        pass
-                    logger.info(f"Cancelled task {task_name} for guild {guild_id}")
-
-            del self.active_tasks[guild_id]
-
-    def add_task(self, guild_id: str, task_name: str, task: asyncio.Task):
-        """Register a task for cleanup"""
-        logger.debug(f"Adding task {task_name} for guild {guild_id}")
-        if guild_id not in self.active_tasks:
-            self.active_tasks[guild_id] = {}
-
-        # Cancel existing task with same name
-        if task_name in self.active_tasks[guild_id]:
-            old_task = self.active_tasks[guild_id][task_name]
-            if not old_task.done():
-                old_task.cancel()
-
-        self.active_tasks[guild_id][task_name] = task
-
-    async def play_audio_source(self, guild_id: str, source, after_callback: Optional[Callable] = None) -> bool:
-        """Play audio source with improved error handling"""
-        try:
-            logger.debug(f"play_audio_source called for guild {guild_id}")
-            voice_client = self.voice_clients.get(guild_id)
-            if not voice_client:
-                logger.error(f"No voice client for guild {guild_id}")
-                return False
-
-            if voice_client.is_playing():
-                voice_client.stop()
-                await asyncio.sleep(0.1)  # Brief pause to ensure cleanup
-
-            # Wrap the after callback with error handling
-            def safe_after_callback(error):
-                if error:
-                    logger.error(f"Player error in guild {guild_id}: {error}")
-                if after_callback:
-                    try:
-                        after_callback(error)
-                    except Exception as e:
-                        logger.error(f"Error in after callback for guild {guild_id}: {e}")
-
-            voice_client.play(source, after=safe_after_callback)
-            logger.info(f"Started playing audio in guild {guild_id}")
-            logger.debug(
-                f"Voice client status after play in guild {guild_id}: playing={voice_client.is_playing()}"
-            )
-            return True
-
-        except Exception as e:
-            logger.error(f"Error playing audio in guild {guild_id}: {e}")
-            return False
-
-    async def health_check(self) -> Dict[str, bool]:
-        """Check health of all voice clients"""
-        health_status = {}
-        logger.debug("Running voice client health check")
-
-        for guild_id, voice_client in self.voice_clients.items():
-            try:
-                is_healthy = (
-                        voice_client.is_connected() and
-                        voice_client.channel is not None
-                )
-                health_status[guild_id] = is_healthy
-                logger.debug(
-                    f"Health status for guild {guild_id}: {is_healthy}"
-                )
-
-                if not is_healthy:
-                    logger.warning(f"Unhealthy voice client in guild {guild_id}")
-
-            except Exception as e:
-                logger.error(f"Health check error for guild {guild_id}: {e}")
-                health_status[guild_id] = False
-        logger.debug(f"Health check results: {health_status}")
-        return health_status
+        self.mark_dirty(client, guild_id)
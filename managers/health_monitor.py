@@ -1,12 +1,17 @@
 import asyncio
+import gc
 import logging
 import time
 from typing import Dict, Set
 import discord
 from config import HEALTH_CHECK_INTERVAL, MEMORY_CLEANUP_INTERVAL, MAX_GUILD_DATA_AGE
+from utils.search_cache import search_cache
 
 logger = logging.getLogger(__name__)
 
+# Upper bound for one health check pass, so a stuck disconnect can't stall every later cycle
+HEALTH_CHECK_TIMEOUT = 60
+
 class HealthMonitor:
     """Background health monitoring and cleanup system"""
     
@@ -61,7 +66,9 @@ class HealthMonitor:
             
             while self.running:
                 try:
-                    await self._perform_health_check()
+                    await asyncio.wait_for(self._perform_health_check(), timeout=HEALTH_CHECK_TIMEOUT)
+                except asyncio.TimeoutError:
+                    logger.warning(f"Health check did not finish within {HEALTH_CHECK_TIMEOUT}s")
                 except Exception:
                     logger.exception("Error in health check loop")
                 
@@ -94,13 +101,16 @@ class HealthMonitor:
         health_status = await self.player_manager.health_check()
         unhealthy_guilds = [guild_id for guild_id, healthy in health_status.items() if not healthy]
         
-        # Clean up unhealthy voice clients
+        # Clean up unhealthy voice clients concurrently; one slow disconnect doesn't hold up the rest
         for guild_id in unhealthy_guilds:
             logger.warning(f"Cleaning up unhealthy voice client for guild {guild_id}")
-            try:
-                await self.player_manager.disconnect_voice_client(guild_id, cleanup_tasks=True)
-            except Exception:
-                logger.exception(f"Error cleaning up unhealthy voice client for guild {guild_id}")
+        results = await asyncio.gather(
+            *(self.player_manager.disconnect_voice_client(guild_id, cleanup_tasks=True) for guild_id in unhealthy_guilds),
+            return_exceptions=True,
+        )
+        for guild_id, result in zip(unhealthy_guilds, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error cleaning up unhealthy voice client for guild {guild_id}", exc_info=result)
                 
         # Check for orphaned tasks
         await self._cleanup_orphaned_tasks()
@@ -151,16 +161,18 @@ class HealthMonitor:
                     invalid_guilds.append(guild_id)
                     continue
                     
-                # Check if guild data is too old (inactive)
                 guild_data = self.client.guilds_data[guild_id]
-                last_activity = guild_data.get('last_activity', current_time)
+                voice_client = self.player_manager.voice_clients.get(guild_id)
+                if voice_client and voice_client.is_connected():
+                    # Connected guilds are active; refreshing here keeps this the only pass over guild data
+                    guild_data['last_activity'] = current_time
+                    continue
                 
+                # Check if guild data is too old (inactive)
+                last_activity = guild_data.get('last_activity', current_time)
                 if current_time - last_activity > MAX_GUILD_DATA_AGE:
-                    # Guild has been inactive for too long
-                    voice_client = self.player_manager.voice_clients.get(guild_id)
-                    if not voice_client or not voice_client.is_connected():
-                        invalid_guilds.append(guild_id)
-                        logger.info(f"Marking inactive guild {guild_id} for cleanup (inactive for {(current_time - last_activity) / 3600:.1f} hours)")
+                    invalid_guilds.append(guild_id)
+                    logger.info(f"Marking inactive guild {guild_id} for cleanup (inactive for {(current_time - last_activity) / 3600:.1f} hours)")
                         
             except Exception as e:
                 logger.warning(f"Error validating guild {guild_id}: {e}")
@@ -190,23 +202,15 @@ class HealthMonitor:
         # Clean up queue
         self.queue_manager.cleanup_guild(guild_id)
         
-        # Save updated data
-        await self.data_manager.save_guilds_data(self.client)
+        # Save updated data (cleanups in one pass share a single write)
+        self.data_manager.mark_dirty(self.client, guild_id)
         
     async def _perform_memory_cleanup(self):
         """Perform memory cleanup operations"""
         logger.debug("Performing memory cleanup")
         
-        # Update last activity timestamps for active guilds
-        current_time = time.time()
-        for guild_id in self.client.guilds_data:
-            voice_client = self.player_manager.voice_clients.get(guild_id)
-            if voice_client and voice_client.is_connected():
-                self.client.guilds_data[guild_id]['last_activity'] = current_time
-        
         # Clean up expired search cache entries
         try:
-            from utils.search_cache import search_cache
             expired_count = search_cache.clear_expired()
             if expired_count > 0:
                 logger.debug(f"Cleaned up {expired_count} expired search cache entries")
@@ -214,7 +218,6 @@ class HealthMonitor:
             logger.warning(f"Error cleaning up search cache: {e}")
                 
         # Force garbage collection for Python objects
-        import gc
         before_count = len(gc.get_objects())
         collected = gc.collect()
         after_count = len(gc.get_objects())
@@ -246,7 +249,6 @@ class HealthMonitor:
             # Get search cache stats
             cache_stats = {"active_entries": 0, "memory_usage": "0B"}
             try:
-                from utils.search_cache import search_cache
                 cache_stats = search_cache.get_stats()
             except Exception as e:
                 logger.debug(f"Could not get cache stats: {e}")
@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import logging
 from typing import Dict, Optional, Callable
 import discord
@@ -86,12 +87,7 @@ class PlayerManager:
                             self_deaf=True,
                         )
 
-                        for _ in range(10):
-                            if voice_client.is_connected():
-                                break
-                            await asyncio.sleep(0.2)
-
-                        if not voice_client.is_connected():
+                        if not await self._wait_until_connected(voice_client):
                             raise ConnectionError("Voice client did not become connected")
 
                         logger.debug(
@@ -157,22 +153,36 @@ class PlayerManager:
                 self.voice_clients.pop(guild_id, None)
                 raise
 
+    @staticmethod
+    async def _wait_until_connected(voice_client: discord.VoiceClient, timeout: float = 2.0) -> bool:
+        """Wait for a fresh voice client to report connected, polling fast first and backing off"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = 0.01
+        while not voice_client.is_connected():
+            if loop.time() >= deadline:
+                return False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.2)
+        return True
+
     async def disconnect_voice_client(self, guild_id: str, cleanup_tasks: bool = True) -> bool:
         """Safely disconnect voice client and cleanup resources"""
         try:
-            logger.debug(f"disconnect_voice_client called for guild {guild_id}")
-            voice_client = self.voice_clients.get(guild_id)
-            if voice_client:
-                if voice_client.is_connected():
-                    await voice_client.disconnect()
-                self.voice_clients.pop(guild_id, None)
-                logger.info(f"Disconnected voice client in guild {guild_id}")
+            logger.debug("disconnect_voice_client called for guild %s", guild_id)
+            # Same lock as connecting, so a disconnect never interleaves with a connect in progress
+            # for this guild (other guilds are unaffected)
+            async with self._get_connection_lock(guild_id):
+                voice_client = self.voice_clients.get(guild_id)
+                if voice_client:
+                    if voice_client.is_connected():
+                        await voice_client.disconnect()
+                    self.voice_clients.pop(guild_id, None)
+                    logger.info(f"Disconnected voice client in guild {guild_id}")
 
             if cleanup_tasks:
                 await self.cleanup_guild_tasks(guild_id)
 
-            self.connection_locks.pop(guild_id, None)
-
             return True
 
         except Exception as e:
@@ -181,9 +191,11 @@ class PlayerManager:
 
     async def cleanup_guild_tasks(self, guild_id: str):
         """Clean up all async tasks for a guild"""
-        logger.debug(f"cleanup_guild_tasks called for guild {guild_id}")
-        if guild_id in self.active_tasks:
-            for task_name, task in self.active_tasks[guild_id].items():
+        logger.debug("cleanup_guild_tasks called for guild %s", guild_id)
+        # Detach the guild's tasks first: their done callbacks fire while we await them below
+        guild_tasks = self.active_tasks.pop(guild_id, None)
+        if guild_tasks:
+            for task_name, task in guild_tasks.items():
                 if not task.done():
                     task.cancel()
                     try:
@@ -192,11 +204,9 @@ class PlayerManager:
                         pass
                     logger.info(f"Cancelled task {task_name} for guild {guild_id}")
 
-            del self.active_tasks[guild_id]
-
     def add_task(self, guild_id: str, task_name: str, task: asyncio.Task):
         """Register a task for cleanup"""
-        logger.debug(f"Adding task {task_name} for guild {guild_id}")
+        logger.debug("Adding task %s for guild %s", task_name, guild_id)
         if guild_id not in self.active_tasks:
             self.active_tasks[guild_id] = {}
 
@@ -207,10 +217,20 @@ class PlayerManager:
                 old_task.cancel()
 
         self.active_tasks[guild_id][task_name] = task
+        task.add_done_callback(functools.partial(self._forget_task, guild_id, task_name))
+
+    def _forget_task(self, guild_id: str, task_name: str, task: asyncio.Task) -> None:
+        """Drop a finished task right away so its frame (and what it references) can be collected"""
+        guild_tasks = self.active_tasks.get(guild_id)
+        # A replaced task finishes after its successor is registered under the same name
+        if guild_tasks and guild_tasks.get(task_name) is task:
+            del guild_tasks[task_name]
+            if not guild_tasks:
+                del self.active_tasks[guild_id]
 
     def cancel_task(self, guild_id: str, task_name: str) -> None:
         """Cancel a registered task if it exists"""
-        logger.debug(f"Cancelling task {task_name} for guild {guild_id}")
+        logger.debug("Cancelling task %s for guild %s", task_name, guild_id)
         guild_tasks = self.active_tasks.get(guild_id)
         if not guild_tasks:
             return
@@ -222,7 +242,7 @@ class PlayerManager:
     async def play_audio_source(self, guild_id: str, source, after_callback: Optional[Callable] = None) -> bool:
         """Play audio source with improved error handling"""
         try:
-            logger.debug(f"play_audio_source called for guild {guild_id}")
+            logger.debug("play_audio_source called for guild %s", guild_id)
             voice_client = self.voice_clients.get(guild_id)
             if not voice_client:
                 logger.error(f"No voice client for guild {guild_id}")
@@ -244,9 +264,10 @@ class PlayerManager:
 
             voice_client.play(source, after=safe_after_callback)
             logger.info(f"Started playing audio in guild {guild_id}")
-            logger.debug(
-                f"Voice client status after play in guild {guild_id}: playing={voice_client.is_playing()}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Voice client status after play in guild %s: playing=%s", guild_id, voice_client.is_playing()
+                )
             return True
 
         except Exception as e:
@@ -265,9 +286,7 @@ class PlayerManager:
                         voice_client.channel is not None
                 )
                 health_status[guild_id] = is_healthy
-                logger.debug(
-                    f"Health status for guild {guild_id}: {is_healthy}"
-                )
+                logger.debug("Health status for guild %s: %s", guild_id, is_healthy)
 
                 if not is_healthy:
                     logger.warning(f"Unhealthy voice client in guild {guild_id}")
@@ -276,5 +295,5 @@ class PlayerManager:
                 logger.error(f"Health check error for guild {guild_id}: {e}")
                 health_status[guild_id] = False
 
-        logger.debug(f"Health check results: {health_status}")
+        logger.debug("Health check results: %s", health_status)
         return health_status
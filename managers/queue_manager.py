@@ -43,6 +43,28 @@ class QueueManager:
             logger.error(f"Error adding song to queue in guild {guild_id}: {e}")
             return False
 
+    def add_songs(self, guild_id: str, songs: List[dict]) -> int:
+        """Append songs to the end of the queue up to the size limit and return how many were added"""
+        try:
+            queue = self.queues.setdefault(guild_id, [])
+            room = MAX_QUEUE_SIZE - len(queue)
+            if room <= 0:
+                logger.warning(f"Queue for guild {guild_id} is at maximum size ({MAX_QUEUE_SIZE})")
+                return 0
+
+            added = songs[:room]
+            queue.extend(added)
+            if len(added) < len(songs):
+                logger.warning(f"Queue for guild {guild_id} reached maximum size ({MAX_QUEUE_SIZE}), "
+                               f"dropped {len(songs) - len(added)} songs")
+
+            logger.info(f"Added {len(added)} songs to guild {guild_id} queue (queue size: {len(queue)})")
+            return len(added)
+
+        except Exception as e:
+            logger.error(f"Error adding songs to queue in guild {guild_id}: {e}")
+            return 0
+
     def get_next_song(self, guild_id: str) -> Optional[dict]:
         """Get and remove the next song from queue"""
         queue = self.queues.get(guild_id, [])
@@ -50,6 +72,10 @@ class QueueManager:
             return queue.pop(0)
         return None
 
+    def peek_next(self, guild_id: str, count: int = 1) -> List[dict]:
+        """Get the next songs in the queue without removing them"""
+        return self.queues.get(guild_id, [])[:count]
+
     def remove_song(self, guild_id: str, index: int) -> Optional[dict]:
         """Remove a song at specific index"""
         try:
@@ -88,6 +114,10 @@ class QueueManager:
         """Get the length of the queue"""
         return len(self.queues.get(guild_id, []))
 
+    def get_queue_room(self, guild_id: str) -> int:
+        """Get how many more songs fit in the queue"""
+        return max(0, MAX_QUEUE_SIZE - len(self.queues.get(guild_id, [])))
+
     def save_repeat_all_playlist(self, guild_id: str):
         """Save the current queue state for repeat all mode"""
         queue = self.queues.get(guild_id, [])
@@ -9,6 +9,7 @@ from discord import Embed
 from config import PlaybackMode
 from ui.views import MusicControlView
 from utils.format_utils import format_time
+from utils.vote_manager import VoteManager
 
 logger = logging.getLogger(__name__)
 
@@ -141,8 +142,6 @@ def create_now_playing_embed(guild_id: str, guild_data: dict) -> Embed:
 
     try:
         if voice_client and voice_client.channel:
-            from utils.vote_manager import VoteManager
-
             vote_status = VoteManager.get_vote_status(guild_data, voice_client.channel)
             if vote_status['current_votes'] > 0:
                 bar = '█' * vote_status['current_votes'] + '░' * (
@@ -311,10 +310,7 @@ async def _update_stable_message_now(guild_id: str):
                     return
 
         if stable_message_changed:
-            try:
-                await data_manager.save_guilds_data(client)
-            except Exception:
-                logger.exception('Failed to save guild data after stable message id change in guild %s', guild_id)
+            data_manager.mark_dirty(client, guild_id)
 
     except Exception:
         logger.exception('Critical error in update_stable_message for guild %s', guild_id)
@@ -4,22 +4,18 @@ import discord
 from discord.ui import Modal, TextInput
 from typing import List, Dict
 from utils.format_utils import format_time
+from utils.message_utils import clear_channel_messages
+from ui.search_view import create_search_results_embed
 import re
 
 logger = logging.getLogger(__name__)
 
+# Any of these marks the input as a link rather than a search query
+_URL_RE = re.compile(r'https?://|www\.|youtube\.com|youtu\.be|spotify\.com|soundcloud\.com', re.IGNORECASE)
+
 def _is_url(text: str) -> bool:
     """Check if the input text is a URL"""
-    url_patterns = [
-        r'https?://',
-        r'www\.',
-        r'youtube\.com',
-        r'youtu\.be',
-        r'spotify\.com',
-        r'soundcloud\.com'
-    ]
-    text_lower = text.lower().strip()
-    return any(re.search(pattern, text_lower) for pattern in url_patterns)
+    return _URL_RE.search(text) is not None
 
 class ModalSearchResultsView(discord.ui.View):
     """Search results view specifically for modal integration with play_next support"""
@@ -136,7 +132,6 @@ class ModalSearchResultSelect(discord.ui.Select):
             from bot_state import client
             guild_data = client.guilds_data.get(guild_id)
             if guild_data:
-                from utils.message_utils import clear_channel_messages
                 channel_id = guild_data.get('channel_id')
                 stable_message_id = guild_data.get('stable_message_id')
                 if channel_id and stable_message_id:
@@ -207,7 +202,6 @@ class AddSongModal(Modal):
                     from bot_state import client
                     guild_data = client.guilds_data.get(guild_id)
                     if guild_data:
-                        from utils.message_utils import clear_channel_messages
                         stable_message_id = guild_data.get('stable_message_id')
                         if stable_message_id:
                             try:
@@ -226,8 +220,6 @@ class AddSongModal(Modal):
                         return
 
                     # Create search results view and embed
-                    from ui.search_view import create_search_results_embed
-                    
                     view = ModalSearchResultsView(search_results, self.play_next)
                     embed = create_search_results_embed(search_results, song_name_or_url)
                     
@@ -269,7 +261,6 @@ class AddSongModal(Modal):
                     from bot_state import client
                     guild_data = client.guilds_data.get(guild_id)
                     if guild_data:
-                        from utils.message_utils import clear_channel_messages
                         stable_message_id = guild_data.get('stable_message_id')
                         if stable_message_id:
                             try:
@@ -9,7 +9,9 @@ import discord
 from discord import ButtonStyle
 from discord.ui import View, Button, Select
 from typing import List, Dict, Optional, Callable
-from utils.format_utils import format_time
+from utils.format_utils import format_time, format_views
+from utils.message_utils import clear_channel_messages
+from utils.search_optimizer import search_optimizer
 
 logger = logging.getLogger(__name__)
 
@@ -82,7 +84,6 @@ class SearchResultSelect(Select):
                 # This is a fast result, we need full metadata for playback
                 await interaction.response.defer(ephemeral=True)
                 
-                from utils.search_optimizer import search_optimizer
                 full_metadata = await search_optimizer.get_full_metadata(song_url)
                 
                 if full_metadata:
@@ -122,7 +123,6 @@ class SearchResultSelect(Select):
             from bot_state import client
             guild_data = client.guilds_data.get(guild_id)
             if guild_data:
-                from utils.message_utils import clear_channel_messages
                 stable_message_id = guild_data.get('stable_message_id')
                 if stable_message_id:
                     try:
@@ -161,24 +161,8 @@ def create_search_results_embed(search_results: List[Dict], query: str) -> disco
         title = result.get('title', 'Unknown Title')
         uploader = result.get('uploader', 'Unknown Artist')
         duration = result.get('duration', 0)
-        view_count = result.get('view_count', 0)
-        
-        # Format duration
-        if duration:
-            duration_str = format_time(duration)
-        else:
-            duration_str = "Unknown"
-        
-        # Format view count
-        if view_count:
-            if view_count >= 1000000:
-                view_str = f"{view_count/1000000:.1f}M views"
-            elif view_count >= 1000:
-                view_str = f"{view_count/1000:.1f}K views"
-            else:
-                view_str = f"{view_count} views"
-        else:
-            view_str = "Unknown views"
+        duration_str = format_time(duration) if duration else "Unknown"
+        view_str = format_views(result.get('view_count', 0))
         
         embed.add_field(
             name=f"{i}. {title}",
@@ -6,6 +6,7 @@ from discord import ButtonStyle, Embed
 from discord.ui import Button, View
 
 from config import PlaybackMode
+from utils.vote_manager import VoteManager
 
 logger = logging.getLogger(__name__)
 
@@ -190,6 +191,20 @@ class QueuePaginationView(View):
 class MusicControlView(View):
     """Compact persistent music control view for the stable panel."""
 
+    # Fixed buttons after the play/pause toggle, in panel order:
+    # (label, style, row, custom_id, callback name, disabled while nothing is playing)
+    _BUTTON_SPECS = (
+        ('⏭ Skip', ButtonStyle.primary, 0, 'skip_button', 'skip_button', True),
+        ('⏹ Stop', ButtonStyle.danger, 0, 'stop_button', 'stop_button', True),
+        ('📜 Queue', ButtonStyle.secondary, 0, 'view_queue_button', 'view_queue_button', False),
+        ('➕ Add', ButtonStyle.success, 1, 'add_song_button', 'add_song_button', False),
+        ('⏩ Play Next', ButtonStyle.success, 1, 'add_next_song_button', 'add_next_song_button', False),
+        ('↕ Move', ButtonStyle.secondary, 1, 'move_song_button', 'move_button', False),
+        ('❌ Remove', ButtonStyle.danger, 1, 'remove_song_button', 'remove_button', False),
+        ('🔀 Shuffle', ButtonStyle.secondary, 2, 'shuffle_button', 'shuffle_button', False),
+        ('🗑 Clear', ButtonStyle.danger, 2, 'clear_queue_button', 'clear_queue_button', False),
+    )
+
     def __init__(self, guild_id: str, timeout: Optional[float] = None):
         super().__init__(timeout=timeout)
         self.guild_id = str(guild_id)
@@ -226,73 +241,15 @@ class MusicControlView(View):
             custom_id='toggle_play_pause_button',
             callback=self.toggle_play_pause_button,
         )
-        self._add_button(
-            label='⏭ Skip',
-            style=ButtonStyle.primary,
-            row=0,
-            custom_id='skip_button',
-            callback=self.skip_button,
-            disabled=not has_active_playback,
-        )
-        self._add_button(
-            label='⏹ Stop',
-            style=ButtonStyle.danger,
-            row=0,
-            custom_id='stop_button',
-            callback=self.stop_button,
-            disabled=not has_active_playback,
-        )
-        self._add_button(
-            label='📜 Queue',
-            style=ButtonStyle.secondary,
-            row=0,
-            custom_id='view_queue_button',
-            callback=self.view_queue_button,
-        )
-
-        self._add_button(
-            label='➕ Add',
-            style=ButtonStyle.success,
-            row=1,
-            custom_id='add_song_button',
-            callback=self.add_song_button,
-        )
-        self._add_button(
-            label='⏩ Play Next',
-            style=ButtonStyle.success,
-            row=1,
-            custom_id='add_next_song_button',
-            callback=self.add_next_song_button,
-        )
-        self._add_button(
-            label='↕ Move',
-            style=ButtonStyle.secondary,
-            row=1,
-            custom_id='move_song_button',
-            callback=self.move_button,
-        )
-        self._add_button(
-            label='❌ Remove',
-            style=ButtonStyle.danger,
-            row=1,
-            custom_id='remove_song_button',
-            callback=self.remove_button,
-        )
-
-        self._add_button(
-            label='🔀 Shuffle',
-            style=ButtonStyle.secondary,
-            row=2,
-            custom_id='shuffle_button',
-            callback=self.shuffle_button,
-        )
-        self._add_button(
-            label='🗑 Clear',
-            style=ButtonStyle.danger,
-            row=2,
-            custom_id='clear_queue_button',
-            callback=self.clear_queue_button,
-        )
+        for label, style, row, custom_id, callback_name, needs_playback in self._BUTTON_SPECS:
+            self._add_button(
+                label=label,
+                style=style,
+                row=row,
+                custom_id=custom_id,
+                callback=getattr(self, callback_name),
+                disabled=needs_playback and not has_active_playback,
+            )
         self.add_item(PlaybackModeSelect(row=3, custom_id='playback_mode_select'))
 
     def _add_button(self, *, label: str, style: ButtonStyle, row: int, custom_id: str, callback, disabled: bool = False):
@@ -375,7 +332,6 @@ class MusicControlView(View):
     async def skip_button(self, interaction: discord.Interaction):
         from bot_state import client, player_manager
         from ui.embeds import update_stable_message
-        from utils.vote_manager import VoteManager
 
         guild_id = self._resolve_guild_id(interaction)
         user_id = interaction.user.id
@@ -408,12 +364,13 @@ class MusicControlView(View):
             await self._safe_interaction_response(interaction, '❌ You have already voted to skip this song.')
             return
 
-        if VoteManager.check_vote_threshold(guild_data, voice_client.channel):
+        # One status read counts the channel's members once for both the threshold and the reply
+        vote_status = VoteManager.get_vote_status(guild_data, voice_client.channel)
+        if vote_status['can_skip']:
             voice_client.stop()
             VoteManager.reset_votes(guild_data)
             await self._safe_interaction_response(interaction, '⏭ Vote threshold reached. Skipping song.')
         else:
-            vote_status = VoteManager.get_vote_status(guild_data, voice_client.channel)
             progress_bar = (
                 '█' * vote_status['current_votes']
                 + '░' * (vote_status['required_votes'] - vote_status['current_votes'])
@@ -1,3 +1,4 @@
+import re
 import time
 import logging
 from collections import OrderedDict
@@ -25,15 +26,20 @@ class SongCache:
         """Get cached song data if exists and not expired (thread-safe)"""
         key = self._make_key(query)
         
+        # Definite misses (new search queries, unseen URLs) skip the lock entirely;
+        # a dict membership test is already an exact, GIL-atomic filter
+        if key not in self._cache:
+            self._misses += 1
+            return None
+        
         with self._lock:
-            if key not in self._cache:
+            entry = self._cache.get(key)
+            if entry is None:
                 self._misses += 1
                 return None
             
-            entry = self._cache[key]
-            
             # Check TTL
-            if time.time() - entry['cached_at'] > self.ttl:
+            if time.monotonic() - entry['cached_at'] > self.ttl:
                 del self._cache[key]
                 self._misses += 1
                 logger.debug(f"Cache expired for: {query[:50]}")
@@ -61,7 +67,7 @@ class SongCache:
             
             self._cache[key] = {
                 'data': data,
-                'cached_at': time.time()
+                'cached_at': time.monotonic()
             }
             logger.debug(f"Cached: {query[:50]}")
     
@@ -97,7 +103,7 @@ class SongCache:
                 return None
             
             entry = self._cache[key]
-            return time.time() - entry['cached_at']
+            return time.monotonic() - entry['cached_at']
     
     def remove(self, query: str) -> bool:
         """Remove specific entry from cache (thread-safe)"""
@@ -113,7 +119,7 @@ class SongCache:
     def cleanup_expired(self) -> int:
         """Remove all expired entries and return count (thread-safe)"""
         with self._lock:
-            current_time = time.time()
+            current_time = time.monotonic()
             expired_keys = [
                 key for key, entry in self._cache.items()
                 if current_time - entry['cached_at'] > self.ttl
@@ -127,6 +133,26 @@ class SongCache:
         
         return len(expired_keys)
 
+# YouTube video IDs as they appear in watch, short-link and shorts URLs
+_VIDEO_ID_RE = re.compile(r'(?:v=|youtu\.be/|/shorts/)([\w-]{11})')
+
+def extract_video_id(url: str) -> Optional[str]:
+    """Return the 11-character YouTube video ID in a URL, if there is one"""
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else None
+
+# Unix expiry time that YouTube signs into stream URLs
+_STREAM_EXPIRE_RE = re.compile(r'[?&/]expire[=/](\d+)')
+
+def stream_url_expired(url: str, margin: float = 60.0) -> bool:
+    """Whether a stream URL's signed expiry has passed (or will within margin seconds)"""
+    match = _STREAM_EXPIRE_RE.search(url)
+    return bool(match) and int(match.group(1)) - margin <= time.time()
+
 # Global instance
 song_cache = SongCache()
 
+# Full video metadata keyed by video ID, so every URL form of a video shares one entry;
+# the TTL stays well under YouTube's ~6h stream URL expiry
+metadata_cache = SongCache(max_size=2048, ttl_seconds=1800)
+
@@ -1,12 +1,24 @@
+# (threshold, divisor, suffix) for abbreviated view counts, largest first
+_VIEW_UNITS = ((1_000_000_000, 1e9, 'B'), (1_000_000, 1e6, 'M'), (1_000, 1e3, 'K'))
+
 def format_time(seconds):
     """Format time in seconds to MM:SS format"""
     if not seconds:
         return "00:00"
 
-    minutes = int(seconds) // 60
-    secs = int(seconds) % 60
+    minutes, secs = divmod(int(seconds), 60)
     return f"{minutes:02d}:{secs:02d}"
 
+def format_views(view_count):
+    """Format a view count with a K/M/B suffix"""
+    if not view_count:
+        return "Unknown views"
+
+    for threshold, divisor, suffix in _VIEW_UNITS:
+        if view_count >= threshold:
+            return f"{view_count / divisor:.1f}{suffix} views"
+    return f"{view_count} views"
+
 def format_duration(duration):
     """Format duration with hours if needed"""
     try:
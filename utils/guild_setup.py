@@ -1,6 +1,7 @@
+import asyncio
 import logging
 import time
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
 import discord
 
@@ -8,6 +9,25 @@ from config import MUSIC_CHANNEL_NAME
 
 logger = logging.getLogger(__name__)
 
+# Permissions @everyone gets on a newly created music channel
+_DEFAULT_OVERWRITE = discord.PermissionOverwrite(
+    view_channel=True,
+    send_messages=True,
+    read_message_history=True,
+)
+
+# Serializes panel setup/reset per guild so concurrent runs can't create duplicate channels
+_setup_locks: Dict[str, asyncio.Lock] = {}
+
+
+def get_setup_lock(guild_id: str) -> asyncio.Lock:
+    """Get the setup/reset lock for a guild"""
+    lock = _setup_locks.get(guild_id)
+    if lock is None:
+        lock = asyncio.Lock()
+        _setup_locks[guild_id] = lock
+    return lock
+
 
 def resolve_music_channel(
     guild: discord.Guild,
@@ -28,9 +48,14 @@ def resolve_music_channel(
         if isinstance(channel, discord.TextChannel):
             return channel
 
-    channel = discord.utils.get(guild.text_channels, name=channel_name)
-    if isinstance(channel, discord.TextChannel):
-        return channel
+    # Scan the channel map directly: guild.text_channels builds and sorts a new list on every
+    # access. Ties resolve to the first channel in sidebar order, as text_channels would.
+    matches = [
+        channel for channel in guild.channels
+        if channel.name == channel_name and isinstance(channel, discord.TextChannel)
+    ]
+    if matches:
+        return min(matches, key=lambda channel: (channel.position, channel.id))
 
     return None
 
@@ -47,22 +72,26 @@ async def ensure_guild_music_panel(
     Returns ``(guild_data, channel, changed)`` when recovery succeeds,
     otherwise ``(None, None, False)``.
     """
+    guild_id = str(guild.id)
+    async with get_setup_lock(guild_id):
+        return await _ensure_guild_music_panel(guild, guild_id, channel_name, create_channel)
+
+
+async def _ensure_guild_music_panel(
+    guild: discord.Guild,
+    guild_id: str,
+    channel_name: str,
+    create_channel: bool,
+) -> Tuple[Optional[dict], Optional[discord.TextChannel], bool]:
     from bot_state import client, data_manager
     from ui.embeds import update_stable_message
 
-    guild_id = str(guild.id)
     guild_data = client.guilds_data.setdefault(guild_id, {})
     changed = False
 
     channel = resolve_music_channel(guild, guild_data, channel_name=channel_name)
     if channel is None and create_channel:
-        overwrites = {
-            guild.default_role: discord.PermissionOverwrite(
-                view_channel=True,
-                send_messages=True,
-                read_message_history=True,
-            )
-        }
+        overwrites = {guild.default_role: _DEFAULT_OVERWRITE}
         channel = await guild.create_text_channel(channel_name, overwrites=overwrites)
         logger.info("Created music channel '%s' in guild %s", channel_name, guild_id)
         changed = True
@@ -88,6 +117,6 @@ async def ensure_guild_music_panel(
         logger.exception('Failed to refresh stable panel for guild %s', guild_id)
 
     if changed:
-        await data_manager.save_guilds_data(client)
+        data_manager.mark_dirty(client, guild_id)
 
     return guild_data, channel, changed
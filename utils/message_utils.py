@@ -9,18 +9,18 @@ async def clear_channel_messages(channel, stable_message_id, limit=100):
     if not stable_message_id:
         return
 
+    def should_delete(message):
+        return message.id != stable_message_id and not message.pinned
+
     try:
-        deleted_count = 0
-        async for message in channel.history(limit=limit):
-            if message.id != stable_message_id and not message.pinned:
-                try:
-                    await message.delete()
-                    deleted_count += 1
-                    await asyncio.sleep(0.1)  # Rate limit protection
-                except discord.Forbidden:
-                    logger.warning(f"Permission error: Cannot delete message {message.id}")
-                except discord.HTTPException as e:
-                    logger.warning(f"Failed to delete message {message.id}: {e}")
+        try:
+            # Bulk delete: up to 100 messages per request; discord.py deletes messages older
+            # than 14 days (which the bulk endpoint rejects) one by one on its own
+            deleted = await channel.purge(limit=limit, check=should_delete, bulk=True)
+            deleted_count = len(deleted)
+        except discord.Forbidden:
+            # Without Manage Messages the bot can still remove what it is allowed to, one at a time
+            deleted_count = await _delete_individually(channel, should_delete, limit)
 
         if deleted_count > 0:
             logger.info(f"Cleared {deleted_count} messages from channel {channel.id}")
@@ -28,6 +28,21 @@ async def clear_channel_messages(channel, stable_message_id, limit=100):
     except Exception as e:
         logger.error(f"Error clearing channel messages: {e}")
 
+async def _delete_individually(channel, should_delete, limit):
+    """Delete matching messages one request at a time"""
+    deleted_count = 0
+    async for message in channel.history(limit=limit):
+        if should_delete(message):
+            try:
+                await message.delete()
+                deleted_count += 1
+                await asyncio.sleep(0.1)  # Rate limit protection
+            except discord.Forbidden:
+                logger.warning(f"Permission error: Cannot delete message {message.id}")
+            except discord.HTTPException as e:
+                logger.warning(f"Failed to delete message {message.id}: {e}")
+    return deleted_count
+
 async def safe_send_message(channel, content, **kwargs):
     """Safely send a message with error handling"""
     try:
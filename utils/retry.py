@@ -1,21 +1,81 @@
 import asyncio
+import atexit
 import logging
+import random
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Dedicated pool for blocking yt-dlp calls so playlist load does not starve the default executor
+YTDL_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="ytdl")
+atexit.register(YTDL_EXECUTOR.shutdown, wait=False)
+
+# Upper bound of the random jitter added to rate-limit waits (seconds)
+RATE_LIMIT_JITTER = 1.0
+
+# Longest rate-limit wait worth sitting through (seconds); a longer Retry-After gives up right away,
+# since the interaction waiting on the result would expire first
+MAX_RATE_LIMIT_WAIT = 5.0
+
+_RETRY_AFTER_RE = re.compile(r'Retry-After:\s*(\d+(?:\.\d+)?)', re.IGNORECASE)
+
+class RateLimited(Exception):
+    """Raised when YouTube answers with HTTP 429; carries the Retry-After delay if one was given"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def rate_limited_from(error: Exception) -> Optional[RateLimited]:
+    """Turn a yt-dlp HTTP 429 error into RateLimited, or return None for any other error"""
+    message = str(error)
+    if 'HTTP Error 429' not in message and 'Too Many Requests' not in message:
+        return None
+
+    match = _RETRY_AFTER_RE.search(message)
+    return RateLimited(message, float(match.group(1)) if match else None)
+
+def run_extraction(ytdl, url):
+    """Blocking yt-dlp extract_info that re-raises throttling errors as RateLimited"""
+    try:
+        return ytdl.extract_info(url, download=False)
+    except Exception as e:
+        rate_limited = rate_limited_from(e)
+        if rate_limited is not None:
+            raise rate_limited from e
+        raise
+
 async def retry_async(coro_func, max_retries=3, base_delay=1.0, *args, **kwargs):
-    """Retry an async function with exponential backoff"""
+    """Retry an async function with exponential backoff, honoring Retry-After when rate limited"""
     last_exception = None
     
     for attempt in range(max_retries):
+        last_attempt = attempt == max_retries - 1
         try:
             return await coro_func(*args, **kwargs)
+        except RateLimited as e:
+            last_exception = e
+            if e.retry_after is not None and e.retry_after > MAX_RATE_LIMIT_WAIT:
+                logger.warning(f"Rate limited with Retry-After {e.retry_after}s, giving up")
+                raise
+            if last_attempt:
+                break
+            backoff = base_delay * (2 ** attempt)
+            delay = min(max(e.retry_after or 0, backoff), MAX_RATE_LIMIT_WAIT) + random.uniform(0, RATE_LIMIT_JITTER)
+            logger.warning(
+                f"Attempt {attempt + 1}/{max_retries} rate limited (Retry-After: {e.retry_after}). "
+                f"Retrying in {delay:.1f}s..."
+            )
+            await asyncio.sleep(delay)
         except Exception as e:
             last_exception = e
+            if last_attempt:
+                break
             delay = base_delay * (2 ** attempt)  # Exponential backoff: 1s, 2s, 4s
             logger.warning(f"Attempt {attempt + 1}/{max_retries} failed: {e}. Retrying in {delay}s...")
             await asyncio.sleep(delay)
     
     logger.error(f"All {max_retries} attempts failed")
     raise last_exception
-
@@ -3,21 +3,25 @@ In-memory search cache for optimized YouTube search performance.
 Implements TTL-based caching with query normalization.
 """
 
+import math
+import random
 import time
 import hashlib
 import logging
+from collections import OrderedDict
 from typing import Dict, List, Optional, Any
 from threading import Lock
 
 logger = logging.getLogger(__name__)
 
 class SearchCache:
-    """Thread-safe in-memory cache for search results with TTL support"""
+    """Thread-safe in-memory LRU cache for search results with per-entry TTL support"""
     
-    def __init__(self, default_ttl: int = 3600):  # 1 hour default TTL
-        self.cache: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, default_ttl: int = 3600, max_size: int = 1000):  # 1 hour default TTL
+        self.cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
         self.lock = Lock()
         self.default_ttl = default_ttl
+        self.max_size = max_size
         
     def _normalize_query(self, query: str) -> str:
         """Normalize query for consistent caching"""
@@ -41,7 +45,7 @@ class SearchCache:
                 return None
                 
             entry = self.cache[key]
-            current_time = time.time()
+            current_time = time.monotonic()
             
             # Check if entry has expired
             if current_time > entry['expires_at']:
@@ -49,30 +53,55 @@ class SearchCache:
                 logger.debug(f"Cache entry expired for query: {query}")
                 return None
                 
+            self.cache.move_to_end(key)
             logger.debug(f"Cache hit for query: {query}")
             return entry['data']
     
-    def set(self, query: str, data: Any, search_mode: bool = False, ttl: Optional[int] = None) -> None:
-        """Cache search results with TTL"""
+    def set(self, query: str, data: Any, search_mode: bool = False, ttl: Optional[int] = None,
+            compute_time: float = 0.0) -> None:
+        """Cache search results with TTL and the time it took to compute them"""
         if not data:  # Don't cache empty results
             return
             
         key = self._generate_key(query, search_mode)
         ttl = ttl or self.default_ttl
-        expires_at = time.time() + ttl
+        now = time.monotonic()
         
         with self.lock:
+            # Evict least recently used entries so the cache stays bounded between expiry sweeps
+            while len(self.cache) >= self.max_size and key not in self.cache:
+                self.cache.popitem(last=False)
+            
             self.cache[key] = {
                 'data': data,
-                'expires_at': expires_at,
-                'created_at': time.time()
+                'expires_at': now + ttl,
+                'created_at': now,
+                'compute_time': compute_time
             }
+            self.cache.move_to_end(key)
             
         logger.debug(f"Cached search results for query: {query} (TTL: {ttl}s)")
     
+    def should_refresh_early(self, query: str, search_mode: bool = False, beta: float = 1.0) -> bool:
+        """
+        Probabilistic early expiry (XFetch): the closer an entry is to expiring and the
+        slower it was to compute, the more likely a read is told to refresh it. Spreads
+        refreshes of popular queries instead of letting them all expire at once.
+        """
+        key = self._generate_key(query, search_mode)
+        
+        with self.lock:
+            entry = self.cache.get(key)
+            if not entry or not entry.get('compute_time'):
+                return False
+            
+            # -log(U) is exponentially distributed, so early refreshes get likelier near expiry
+            xfetch = -beta * entry['compute_time'] * math.log(1.0 - random.random())
+            return time.monotonic() + xfetch >= entry['expires_at']
+    
     def clear_expired(self) -> int:
         """Remove expired entries from cache and return count of removed entries"""
-        current_time = time.time()
+        current_time = time.monotonic()
         expired_keys = []
         
         with self.lock:
@@ -100,7 +129,7 @@ class SearchCache:
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         with self.lock:
-            current_time = time.time()
+            current_time = time.monotonic()
             total_entries = len(self.cache)
             expired_entries = sum(
                 1 for entry in self.cache.values() 
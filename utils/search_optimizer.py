@@ -4,17 +4,29 @@ Handles two-phase search approach and query optimization.
 """
 
 import asyncio
+import functools
 import logging
 import time
 import unicodedata
 from typing import List, Dict, Optional, Any
 import yt_dlp as youtube_dl
 from config import FAST_SEARCH_OPTS, FULL_METADATA_OPTS
-from utils.retry import retry_async
-from utils.cache import song_cache
+from utils.retry import retry_async, run_extraction, YTDL_EXECUTOR
+from utils.cache import metadata_cache, extract_video_id
 
 logger = logging.getLogger(__name__)
 
+# Prefix for building watch URLs from bare video IDs
+_WATCH_PREFIX = "https://www.youtube.com/watch?v="
+
+# Common filler words that don't help search (English and Vietnamese)
+_FILLER_WORDS = frozenset({
+    # English filler words
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'from',
+    # Vietnamese filler words
+    'và', 'của', 'cho', 'từ', 'với', 'tại', 'trong', 'ngoài'
+})
+
 class SearchOptimizer:
     """Handles optimized YouTube search with two-phase approach"""
     
@@ -22,6 +34,8 @@ class SearchOptimizer:
         # Initialize optimized yt-dlp instances
         self.fast_ytdl = youtube_dl.YoutubeDL(FAST_SEARCH_OPTS)
         self.full_ytdl = youtube_dl.YoutubeDL(FULL_METADATA_OPTS)
+        # Searches currently running, keyed by normalized query, so identical requests share one call
+        self._inflight: Dict[str, asyncio.Task] = {}
     
     async def get_best_result(self, query: str) -> Optional[Dict[str, Any]]:
         """
@@ -36,7 +50,7 @@ class SearchOptimizer:
             
             loop = asyncio.get_running_loop()
             search_results = await loop.run_in_executor(
-                None, lambda: self.fast_ytdl.extract_info(search_query, download=False)
+                YTDL_EXECUTOR, self.fast_ytdl.extract_info, search_query, False
             )
             
             elapsed = time.time() - start_time
@@ -65,13 +79,27 @@ class SearchOptimizer:
         Phase 1: Fast search with minimal metadata extraction
         Returns basic info quickly for user selection
         """
+        # Join an identical search that is already running instead of issuing another one;
+        # the search is its own task, so a cancelled caller never cancels it for the others
+        key = f"{max_results}:{query.strip().lower()}"
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run_fast_search(query, max_results))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            logger.debug(f"Joining in-flight search for query: {query}")
+        return await asyncio.shield(task)
+
+    async def _run_fast_search(self, query: str, max_results: int) -> Optional[List[Dict[str, Any]]]:
+        """Run a flat ytsearch and process its entries"""
         try:
             start_time = time.time()
             search_query = f"ytsearch{max_results}:{query}"
             
             loop = asyncio.get_running_loop()
             search_results = await loop.run_in_executor(
-                None, lambda: self.fast_ytdl.extract_info(search_query, download=False)
+                YTDL_EXECUTOR, self.fast_ytdl.extract_info, search_query, False
             )
             
             elapsed = time.time() - start_time
@@ -81,13 +109,9 @@ class SearchOptimizer:
                 logger.debug(f"No search results found for query: {query}")
                 return None
             
-            # Process and enhance basic results
-            processed_results = []
-            for entry in search_results['entries'][:max_results]:
-                if entry:  # Skip None entries
-                    processed_entry = self._process_fast_result(entry)
-                    if processed_entry:
-                        processed_results.append(processed_entry)
+            # Process and enhance basic results (None entries and unusable rows are dropped)
+            entries = search_results['entries'][:max_results]
+            processed_results = [result for result in map(self._process_fast_result, entries) if result]
             
             logger.debug(f"Processed {len(processed_results)} fast search results")
             return processed_results
@@ -103,7 +127,8 @@ class SearchOptimizer:
         Uses retry logic for resilience and caching for performance
         """
         # Check cache first
-        cached_result = song_cache.get(video_url)
+        cache_key = extract_video_id(video_url) or video_url
+        cached_result = metadata_cache.get(cache_key)
         if cached_result is not None:
             logger.debug(f"Cache hit for full metadata: {video_url[:50]}")
             return cached_result
@@ -113,7 +138,7 @@ class SearchOptimizer:
             
             loop = asyncio.get_running_loop()
             result = await loop.run_in_executor(
-                None, lambda: self.full_ytdl.extract_info(video_url, download=False)
+                YTDL_EXECUTOR, run_extraction, self.full_ytdl, video_url
             )
             
             elapsed = time.time() - start_time
@@ -127,7 +152,7 @@ class SearchOptimizer:
             
             # Cache successful results
             if result:
-                song_cache.set(video_url, result)
+                metadata_cache.set(cache_key, result)
                 logger.debug(f"Cached full metadata for: {video_url[:50]}")
             
             return result
@@ -148,8 +173,8 @@ class SearchOptimizer:
             
             # Generate YouTube URL if not present
             webpage_url = entry.get('url') or entry.get('webpage_url')
-            if not webpage_url and video_id:
-                webpage_url = f"https://www.youtube.com/watch?v={video_id}"
+            if not webpage_url:
+                webpage_url = _WATCH_PREFIX + video_id
             
             # Create enhanced result with available data
             enhanced_result = {
@@ -158,8 +183,8 @@ class SearchOptimizer:
                 'uploader': uploader,
                 'webpage_url': webpage_url,
                 'url': webpage_url,
-                'duration': entry.get('duration', 0),
-                'view_count': entry.get('view_count', 0),
+                'duration': entry.get('duration') or 0,
+                'view_count': entry.get('view_count') or 0,
                 'description': entry.get('description', ''),
                 'upload_date': entry.get('upload_date', ''),
                 'thumbnail': entry.get('thumbnail', ''),
@@ -174,29 +199,24 @@ class SearchOptimizer:
             logger.error(f"Error processing fast result: {e}")
             return None
     
-    def preprocess_query(self, query: str) -> str:
-        """Optimize search query for better results"""
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def preprocess_query(query: str) -> str:
+        """Optimize search query for better results (pure, so repeated queries are served from a cache)"""
         # Normalize Unicode characters to handle Vietnamese diacritical marks properly
         # Use NFC to maintain Vietnamese characters while normalizing encoding
         normalized_query = unicodedata.normalize('NFC', query)
         
-        # Remove common filler words that don't help search (English and Vietnamese)
-        filler_words = {
-            # English filler words
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'from',
-            # Vietnamese filler words
-            'và', 'của', 'cho', 'từ', 'với', 'tại', 'trong', 'ngoài'
-        }
-        
         # Split query into words
         words = normalized_query.lower().split()
         
         # Keep important words, remove fillers only for longer queries
         # Many song titles are short (\u2264 5 words) and may include these words
-        filtered_words = [word for word in words if word not in filler_words or len(words) <= 5]
+        if len(words) > 5:
+            words = [word for word in words if word not in _FILLER_WORDS]
         
         # Rejoin words
-        optimized_query = ' '.join(filtered_words) if filtered_words else normalized_query
+        optimized_query = ' '.join(words) if words else normalized_query
         
         # Limit query length to avoid overly long searches
         if len(optimized_query) > 100:
@@ -224,7 +244,7 @@ class SearchOptimizer:
             
             loop = asyncio.get_running_loop()
             search_results = await loop.run_in_executor(
-                None, lambda: self.full_ytdl.extract_info(search_query, download=False)
+                YTDL_EXECUTOR, self.full_ytdl.extract_info, search_query, False
             )
             
             elapsed = time.time() - start_time
@@ -9,6 +9,21 @@ import discord
 
 logger = logging.getLogger(__name__)
 
+def _required_votes_for(user_count: int) -> int:
+    """Votes needed to skip for a given number of human listeners"""
+    if user_count <= 2:
+        return 1
+    elif user_count <= 4:
+        return 2
+    elif user_count <= 6:
+        return 3
+    else:
+        # 50% of users, rounded up
+        return max(1, (user_count + 1) // 2)
+
+# Required votes by listener count, precomputed for every realistic voice channel size
+_REQUIRED_VOTES = tuple(_required_votes_for(user_count) for user_count in range(65))
+
 class VoteManager:
     """Manages vote skip functionality for guilds"""
     
@@ -28,18 +43,11 @@ class VoteManager:
             return 1
             
         # Count only human users (exclude bots)
-        human_users = [member for member in voice_channel.members if not member.bot]
-        user_count = len(human_users)
+        user_count = sum(1 for member in voice_channel.members if not member.bot)
         
-        if user_count <= 2:
-            return 1
-        elif user_count <= 4:
-            return 2
-        elif user_count <= 6:
-            return 3
-        else:
-            # 50% of users, rounded up
-            return max(1, (user_count + 1) // 2)
+        if user_count < len(_REQUIRED_VOTES):
+            return _REQUIRED_VOTES[user_count]
+        return _required_votes_for(user_count)
     
     @staticmethod
     def add_vote(guild_data: dict, user_id: int) -> bool: